@@ -0,0 +1,278 @@
+"""Compile JsonCss schemas once into reusable lxml extraction plans."""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from cssselect import HTMLTranslator, SelectorError
+from crawl4ai import JsonCssExtractionStrategy
+from lxml import etree
+from lxml import html as lxml_html
+
+_TRANSLATOR = HTMLTranslator()
+# BeautifulSoup types each string by its innermost script/style/template/rt/rp tag, and
+# get_text() keeps only strings of the element's own type (plain text for other tags)
+_CONTAINERS = frozenset({"script", "style", "template", "rt", "rp"})
+_TEXT = etree.XPath(".//text()")
+_PLAIN_TEXT = etree.XPath(
+    ".//text()[not(ancestor::*[" + " or ".join(f"self::{tag}" for tag in sorted(_CONTAINERS)) + "])]"
+)
+
+# Attributes BeautifulSoup splits into lists; mirrored so output matches JsonCss
+_MULTI_VALUED = frozenset({"class", "rel", "rev", "accept-charset", "headers", "accesskey", "dropzone"})
+
+_PLANS: dict[str, CompiledSchema] = {}
+
+
+@dataclass(frozen=True)
+class _Field:
+    name: str
+    kind: str
+    steps: tuple[str, ...]
+    selector: etree.XPath | None
+    attribute: str | None
+    pattern: re.Pattern | None
+    group: int | str
+    transform: str | None
+    default: Any
+    source: tuple[str | None, tuple[str, ...]] | None
+    function: Any
+    children: tuple[_Field, ...]
+
+
+def _xpath(selector: str, prefix: str) -> etree.XPath:
+    try:
+        return etree.XPath(_TRANSLATOR.css_to_xpath(selector, prefix=prefix))
+    except SelectorError as exc:
+        raise ValueError(f"Cannot compile selector {selector!r}: {exc}") from exc
+
+
+def _compile_field(field: dict[str, Any]) -> _Field:
+    kind = field["type"] if isinstance(field["type"], str) else "pipeline"
+    steps = tuple(field["type"]) if isinstance(field["type"], list) else (field["type"],)
+    source = None
+    if "source" in field:
+        # "+tr.subtext" means "the next sibling <tr class='subtext'>"
+        parts = field["source"].strip().lstrip("+").strip().split(".")
+        source = (parts[0].strip() or None, tuple(part.strip() for part in parts[1:] if part.strip()))
+    return _Field(
+        name=field["name"],
+        kind=kind,
+        steps=steps,
+        selector=_xpath(field["selector"], "descendant::") if field.get("selector") else None,
+        attribute=field.get("attribute"),
+        pattern=re.compile(field["pattern"]) if field.get("pattern") else None,
+        group=field.get("group", 1),
+        transform=field.get("transform"),
+        default=field.get("default"),
+        source=source,
+        function=field.get("function"),
+        children=tuple(_compile_field(child) for child in field.get("fields", [])),
+    )
+
+
+def _container_text(element: Any) -> Iterable[str]:
+    # Strings under a nested container of another kind belong to that container
+    wanted = element.tag
+    owners: list[str] = []
+    for event, node in etree.iterwalk(element, events=("start", "end")):
+        if event == "start":
+            owner = node.tag if node.tag in _CONTAINERS else owners[-1]
+            owners.append(owner)
+            # Comments and processing instructions contribute only their tails
+            if node.text and owner == wanted and isinstance(node.tag, str):
+                yield node.text.strip()
+        else:
+            owners.pop()
+            if node is not element and node.tail and owners[-1] == wanted:
+                yield node.tail.strip()
+
+
+def _text(element: Any) -> str:
+    if element.tag in _CONTAINERS:
+        return "".join(_container_text(element))
+    # Most elements have no container around or inside them: skip the filtered query
+    if next(element.iter(*_CONTAINERS), None) is None and next(element.iterancestors(*_CONTAINERS), None) is None:
+        texts = _TEXT(element)
+    else:
+        texts = _PLAIN_TEXT(element)
+    return "".join(text.strip() for text in texts)
+
+
+class CompiledSchema:
+    """A JsonCss schema with selectors pre-translated to XPath and the field tree flattened.
+
+    Output matches JsonCssExtractionStrategy for the field types it supports
+    (text, attribute, html, regex pipelines, nested, list, nested_list and
+    computed ``function`` fields), but every page is parsed once with lxml and
+    no selector is ever re-parsed.
+    """
+
+    def __init__(self, schema: dict[str, Any]):
+        self.schema = schema
+        self._base = _xpath(schema["baseSelector"], "descendant-or-self::")
+        self._base_fields = tuple(_compile_field(field) for field in schema.get("baseFields", []))
+        self._fields = tuple(_compile_field(field) for field in schema.get("fields", []))
+
+    def extract(self, html: str) -> list[dict[str, Any]]:
+        if not html or not html.strip():
+            return []
+        try:
+            document = lxml_html.document_fromstring(html)
+        except (etree.ParserError, ValueError):
+            return []
+        results = []
+        for element in self._base(document):
+            item = {}
+            for field in self._base_fields:
+                value = self._single(element, field)
+                if value is not None:
+                    item[field.name] = value
+            item.update(self._item(element, self._fields))
+            if item:
+                results.append(item)
+        return results
+
+    def run_many(self, html_list: Iterable[str], workers: int | None = None, chunksize: int = 8) -> list[list[dict[str, Any]]]:
+        """Extract every document, fanning out over a process pool for CPU-bound batches.
+
+        Each worker compiles the schema once at start-up; only HTML strings and
+        result lists cross the process boundary. ``workers=1`` stays in-process.
+        """
+        html_list = list(html_list)
+        if workers == 1 or len(html_list) <= chunksize:
+            return [self.extract(html) for html in html_list]
+        # Fork where available: spawned workers would re-import crawl4ai and the
+        # calling script, which costs more than a typical batch takes to parse
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(self.schema,)) as pool:
+            return list(pool.map(_extract_in_worker, html_list, chunksize=chunksize))
+
+    def _item(self, element: Any, fields: tuple[_Field, ...]) -> dict[str, Any]:
+        item: dict[str, Any] = {}
+        for field in fields:
+            if field.kind == "computed":
+                value = self._computed(item, field)
+            else:
+                value = self._field(element, field)
+            if value is not None:
+                item[field.name] = value
+        return item
+
+    def _field(self, element: Any, field: _Field) -> Any:
+        try:
+            if field.source is not None:
+                element = self._resolve_source(element, field.source)
+                if element is None:
+                    return field.default
+            if field.kind == "nested":
+                matches = field.selector(element) if field.selector is not None else []
+                return self._item(matches[0], field.children) if matches else {}
+            if field.kind == "list":
+                matches = field.selector(element) if field.selector is not None else []
+                return [self._list_item(match, field.children) for match in matches]
+            if field.kind == "nested_list":
+                matches = field.selector(element) if field.selector is not None else []
+                return [self._item(match, field.children) for match in matches]
+            return self._single(element, field)
+        except Exception:
+            return field.default
+
+    def _list_item(self, element: Any, fields: tuple[_Field, ...]) -> dict[str, Any]:
+        item = {}
+        for field in fields:
+            value = self._single(element, field)
+            if value is not None:
+                item[field.name] = value
+        return item
+
+    def _single(self, element: Any, field: _Field) -> Any:
+        if field.selector is not None:
+            matches = field.selector(element)
+            if not matches:
+                return field.default
+            element = matches[0]
+        value: Any = element
+        for step in field.steps:
+            if step == "text":
+                value = _text(value)
+            elif step == "attribute":
+                value = value.get(field.attribute)
+                if value is not None and field.attribute in _MULTI_VALUED:
+                    value = value.split()
+            elif step == "html":
+                value = etree.tostring(value, encoding="unicode", method="html", with_tail=False)
+            elif step == "regex" and field.pattern is not None:
+                if not isinstance(value, str):
+                    value = _text(value)
+                match = field.pattern.search(value)
+                value = match.group(field.group) if match else None
+            if value is None:
+                break
+        if field.transform and isinstance(value, str):
+            value = {"lowercase": str.lower, "uppercase": str.upper, "strip": str.strip}.get(field.transform, str)(value)
+        return value if value is not None else field.default
+
+    @staticmethod
+    def _resolve_source(element: Any, source: tuple[str | None, tuple[str, ...]]) -> Any:
+        tag, classes = source
+        for sibling in element.itersiblings():
+            if not isinstance(sibling.tag, str) or (tag and sibling.tag != tag):
+                continue
+            if all(cls in (sibling.get("class") or "").split() for cls in classes):
+                return sibling
+        return None
+
+    @staticmethod
+    def _computed(item: dict[str, Any], field: _Field) -> Any:
+        # Like JsonCss, "expression" fields are not evaluated; only callables run
+        try:
+            return field.function(item) if field.function is not None else field.default
+        except Exception:
+            return field.default
+
+
+def compile_schema(schema: dict[str, Any]) -> CompiledSchema:
+    """Compiled plan for ``schema``, built once per process per distinct schema."""
+    key = json.dumps(schema, sort_keys=True, default=repr)
+    plan = _PLANS.get(key)
+    if plan is None:
+        plan = _PLANS[key] = CompiledSchema(schema)
+    return plan
+
+
+_WORKER_PLAN: CompiledSchema | None = None
+
+
+def _init_worker(schema: dict[str, Any]) -> None:
+    global _WORKER_PLAN
+    _WORKER_PLAN = compile_schema(schema)
+
+
+def _extract_in_worker(html: str) -> list[dict[str, Any]]:
+    return _WORKER_PLAN.extract(html)
+
+
+class CompiledCssExtractionStrategy(JsonCssExtractionStrategy):
+    """Drop-in JsonCssExtractionStrategy that runs a precompiled plan.
+
+    Schemas the plan cannot express (selectors cssselect rejects) fall back to
+    the stock BeautifulSoup implementation.
+    """
+
+    def __init__(self, schema: dict[str, Any], **kwargs: Any):
+        super().__init__(schema, **kwargs)
+        try:
+            self.plan: CompiledSchema | None = compile_schema(schema)
+        except ValueError:
+            self.plan = None
+
+    def extract(self, url: str, html_content: str, *q: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        if self.plan is None:
+            return super().extract(url, html_content, *q, **kwargs)
+        return self.plan.extract(html_content)
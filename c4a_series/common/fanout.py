@@ -0,0 +1,86 @@
+"""Fetch a page once and fan its HTML out to many markdown generators or extraction strategies."""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.extraction_strategy import ExtractionStrategy
+from crawl4ai.markdown_generation_strategy import MarkdownGenerationStrategy
+
+from c4a_series.common.io import cached_arun, fit_markdown, raw_markdown
+from c4a_series.common.pool import shared_crawler
+
+
+@dataclass
+class StrategyRun:
+    """Output of one strategy applied to the shared page, plus how long it took."""
+
+    output: Any
+    seconds: float
+
+
+@dataclass
+class FanOut:
+    """The single crawl result, its fetch time, and every strategy run keyed by label."""
+
+    result: Any
+    fetch_seconds: float
+    runs: dict[str, StrategyRun] = field(default_factory=dict)
+
+
+def _strategy_input(result: Any, strategy: ExtractionStrategy) -> str:
+    # Mirror how Crawl4AI picks an extraction strategy's input from the crawl result
+    sources = {
+        "markdown": lambda: raw_markdown(result.markdown),
+        "fit_markdown": lambda: fit_markdown(result.markdown),
+        "html": lambda: result.html or "",
+        "cleaned_html": lambda: result.cleaned_html or "",
+        "fit_html": lambda: getattr(result, "fit_html", None) or result.cleaned_html or "",
+    }
+    return sources.get(getattr(strategy, "input_format", "markdown"), sources["markdown"])()
+
+
+def _apply(result: Any, strategy: Any) -> StrategyRun:
+    started = time.perf_counter()
+    if isinstance(strategy, MarkdownGenerationStrategy):
+        # Generators receive cleaned HTML, exactly as they would inside arun()
+        output = strategy.generate_markdown(input_html=result.cleaned_html or "", base_url=result.url)
+    elif isinstance(strategy, ExtractionStrategy):
+        output = strategy.run(result.url, [_strategy_input(result, strategy)])
+    else:
+        raise TypeError(f"Unsupported strategy type: {type(strategy).__name__}")
+    return StrategyRun(output, time.perf_counter() - started)
+
+
+async def fan_out(
+    url: str,
+    strategies: dict[str, Any],
+    config: CrawlerRunConfig | None = None,
+    crawler: AsyncWebCrawler | None = None,
+) -> FanOut:
+    """Fetch ``url`` once, then run every strategy on the cached page concurrently.
+
+    ``strategies`` maps a label to a markdown generator or an extraction strategy.
+    Markdown generators return a MarkdownGenerationResult; extraction strategies
+    return their list of extracted items. Network and render cost is paid once,
+    no matter how many strategies are compared.
+    """
+    config = config or CrawlerRunConfig(cache_mode=CacheMode.BYPASS, verbose=False)
+    started = time.perf_counter()
+    if crawler is None:
+        async with shared_crawler() as pooled:
+            result = await cached_arun(pooled, url, config)
+    else:
+        result = await cached_arun(crawler, url, config)
+    fanned = FanOut(result, time.perf_counter() - started)
+    if not result.success:
+        return fanned
+
+    # Strategies are CPU-bound, so each runs in a worker thread off the event loop
+    labels = list(strategies)
+    runs = await asyncio.gather(*(asyncio.to_thread(_apply, result, strategies[label]) for label in labels))
+    fanned.runs = dict(zip(labels, runs))
+    return fanned
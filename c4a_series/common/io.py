@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import enum
+import gzip
+import hashlib
 import json
 import os
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +15,32 @@ REPO_ROOT = Path(__file__).resolve().parents[3]
 RUNS_DIR = REPO_ROOT / "runs"
 SCHEMA_CACHE_DIR = REPO_ROOT / "schema_cache"
 PATTERN_CACHE_DIR = REPO_ROOT / "pattern_cache"
+RESULT_CACHE_DIR = REPO_ROOT / "result_cache"
+
+# The result cache is opt-in: episodes hard-code CacheMode.BYPASS to show live
+# crawls, so only skip the network when the caller explicitly asks for it
+RESULT_CACHE_ENV = "C4A_RESULT_CACHE"
+RESULT_CACHE_TTL_ENV = "C4A_RESULT_CACHE_TTL"
+RESULT_CACHE_MB_ENV = "C4A_RESULT_CACHE_MB"
+DEFAULT_RESULT_CACHE_TTL = 24 * 3600
+DEFAULT_RESULT_CACHE_MB = 512
+
+# Run-config fields that change how a crawl is logged or cached, not what it returns
+VOLATILE_CONFIG_FIELDS = frozenset(
+    {
+        "cache_mode",
+        "bypass_cache",
+        "disable_cache",
+        "no_cache_read",
+        "no_cache_write",
+        "verbose",
+        "log_console",
+        "session_id",
+        "shared_data",
+        "stream",
+        "semaphore_count",
+    }
+)
 
 
 def load_env(env_file: Path | None = None) -> None:
@@ -55,3 +87,223 @@ def fit_markdown(markdown: Any) -> str:
 def preview(text: str, size: int = 200) -> str:
     return text[:size].replace("\n", " ").strip()
 
+
+
+############################## Result Cache ##################################
+
+
+def _normalize(value: Any, depth: int = 0) -> Any:
+    # Reduce configs and strategy objects to plain JSON so equal settings hash
+    # equally across processes (no memory addresses, no insertion order)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, enum.Enum):
+        return value.value
+    if depth > 4:
+        return type(value).__qualname__
+    if isinstance(value, dict):
+        return {str(k): _normalize(v, depth + 1) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, depth + 1) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(v, depth + 1) for v in value), key=repr)
+    if hasattr(value, "pattern") and hasattr(value, "flags"):
+        return {"__regex__": value.pattern, "flags": value.flags}
+    if hasattr(value, "__dict__"):
+        state = {k: v for k, v in vars(value).items() if not k.startswith("_") and not callable(v)}
+        return {"__type__": type(value).__qualname__, **_normalize(state, depth + 1)}
+    return type(value).__qualname__
+
+
+def config_fingerprint(config: Any) -> dict[str, Any]:
+    """Normalized CrawlerRunConfig without the fields that do not affect output."""
+    if config is None:
+        return {}
+    state = config.to_dict() if hasattr(config, "to_dict") else vars(config)
+    return _normalize({k: v for k, v in state.items() if k not in VOLATILE_CONFIG_FIELDS})
+
+
+def result_cache_key(url: str, config: Any) -> str:
+    payload = json.dumps({"url": url, "config": config_fingerprint(config)}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedMarkdown:
+    raw_markdown: str = ""
+    fit_markdown: str = ""
+    markdown_with_citations: str = ""
+    references_markdown: str = ""
+
+    def __str__(self) -> str:
+        return self.raw_markdown
+
+
+@dataclass
+class CachedResult:
+    """The CrawlResult fields the episodes read, restored from the result cache."""
+
+    url: str
+    success: bool = True
+    status_code: int | None = None
+    error_message: str = ""
+    html: str = ""
+    cleaned_html: str = ""
+    fit_html: str = ""
+    markdown: CachedMarkdown = field(default_factory=CachedMarkdown)
+    extracted_content: str | None = None
+    links: dict[str, Any] = field(default_factory=dict)
+    media: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    from_cache: bool = True
+
+    @classmethod
+    def from_result(cls, result: Any) -> CachedResult:
+        markdown = result.markdown
+        return cls(
+            url=result.url,
+            success=bool(result.success),
+            status_code=getattr(result, "status_code", None),
+            html=result.html or "",
+            cleaned_html=result.cleaned_html or "",
+            fit_html=getattr(result, "fit_html", None) or "",
+            markdown=CachedMarkdown(
+                raw_markdown=raw_markdown(markdown),
+                fit_markdown=fit_markdown(markdown),
+                markdown_with_citations=getattr(markdown, "markdown_with_citations", "") or "",
+                references_markdown=getattr(markdown, "references_markdown", "") or "",
+            ),
+            extracted_content=result.extracted_content,
+            links=result.links or {},
+            media=result.media or {},
+            metadata=getattr(result, "metadata", None) or {},
+        )
+
+
+class ResultCache:
+    """Content-addressed, gzip-compressed crawl results on disk.
+
+    Entries are keyed by sha256(url + normalized run config), expire after
+    ``ttl`` seconds, and the directory is trimmed least-recently-used first
+    (by file mtime, bumped on every hit) once it grows past ``max_bytes``.
+    """
+
+    def __init__(self, root: Path = RESULT_CACHE_DIR, max_bytes: int | None = None, ttl: float | None = None):
+        self.root = root
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_RESULT_CACHE_MB * 1024 * 1024
+        self.ttl = ttl if ttl is not None else DEFAULT_RESULT_CACHE_TTL
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, url: str, config: Any) -> CachedResult | None:
+        path = self._path(result_cache_key(url, config))
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                record = json.load(handle)
+        except (FileNotFoundError, OSError, ValueError):
+            self.misses += 1
+            return None
+        if time.time() - record.get("stored_at", 0) > self.ttl:
+            self._remove(path)
+            self.misses += 1
+            return None
+        os.utime(path)  # Mark as recently used for LRU eviction
+        self.hits += 1
+        record.pop("stored_at", None)
+        record["markdown"] = CachedMarkdown(**record.get("markdown", {}))
+        return CachedResult(**record)
+
+    def put(self, url: str, config: Any, result: Any) -> None:
+        if not result.success:
+            return
+        record = asdict(CachedResult.from_result(result))
+        record["stored_at"] = time.time()
+        path = self._path(result_cache_key(url, config))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+            json.dump(record, handle, ensure_ascii=False, default=str)
+        # An overwritten entry's bytes leave the cache along with it
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp_path, path)  # Readers never see a half-written entry
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += path.stat().st_size - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used until under the size bound."""
+        entries = sorted(self._entries())
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_bytes and now - mtime <= self.ttl:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+
+_RESULT_CACHE: ResultCache | None = None
+
+
+def result_cache() -> ResultCache | None:
+    """The process-wide result cache, or None unless C4A_RESULT_CACHE=1."""
+    global _RESULT_CACHE
+    if os.environ.get(RESULT_CACHE_ENV, "").lower() not in {"1", "true", "yes", "on"}:
+        return None
+    if _RESULT_CACHE is None:
+        _RESULT_CACHE = ResultCache(
+            max_bytes=int(float(os.environ.get(RESULT_CACHE_MB_ENV, DEFAULT_RESULT_CACHE_MB)) * 1024 * 1024),
+            ttl=float(os.environ.get(RESULT_CACHE_TTL_ENV, DEFAULT_RESULT_CACHE_TTL)),
+        )
+    return _RESULT_CACHE
+
+
+async def cached_arun(crawler: Any, url: str, config: Any = None) -> Any:
+    """``crawler.arun()`` that serves repeated (url, config) pairs from the result cache.
+
+    The cache sits in front of Crawl4AI's own cache_mode, so it still answers
+    when an episode hard-codes CacheMode.BYPASS. With the cache disabled this
+    is a plain arun() call.
+    """
+    cache = result_cache()
+    if cache is None:
+        return await crawler.arun(url=url, config=config)
+    cached = await asyncio.to_thread(cache.get, url, config)
+    if cached is not None:
+        return cached
+    result = await crawler.arun(url=url, config=config)
+    await asyncio.to_thread(cache.put, url, config, result)
+    return result
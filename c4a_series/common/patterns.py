@@ -0,0 +1,302 @@
+"""Versioned regex pattern sets on disk, compiled once into as few scans as stay exact."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import string
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from crawl4ai import RegexExtractionStrategy
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from c4a_series.common.io import PATTERN_CACHE_DIR
+
+# Numbered backreferences shift once patterns are wrapped in a combined group
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Characters are tracked over ASCII; every other code point shares one marker
+_NON_ASCII = -1
+_CATEGORIES = {
+    "CATEGORY_DIGIT": frozenset(map(ord, string.digits)) | {_NON_ASCII},
+    "CATEGORY_SPACE": frozenset(map(ord, string.whitespace)) | {_NON_ASCII},
+    "CATEGORY_WORD": frozenset(map(ord, string.ascii_letters + string.digits + "_")) | {_NON_ASCII},
+}
+_ASCII_LETTERS = frozenset(map(ord, string.ascii_letters))
+
+
+def pattern_version(patterns: dict[str, str]) -> str:
+    """Short content hash of a pattern set; changes whenever any label or regex does."""
+    payload = json.dumps(patterns, sort_keys=True, ensure_ascii=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def _union(*sets: frozenset | None) -> frozenset | None:
+    # None stands for "any character"
+    if any(chars is None for chars in sets):
+        return None
+    return frozenset().union(*sets)
+
+
+def _char(code: int, ignore_case: bool) -> frozenset:
+    # Unicode case folding pairs some ASCII letters with other code points
+    # (s/ſ, k/K, i/İ), so under IGNORECASE letters and non-ASCII characters
+    # are assumed to reach each other
+    if code > 127:
+        return frozenset({_NON_ASCII}) | (_ASCII_LETTERS if ignore_case else frozenset())
+    char = chr(code)
+    if ignore_case and char in string.ascii_letters:
+        return frozenset({code, ord(char.swapcase()), _NON_ASCII})
+    return frozenset({code})
+
+
+def _char_class(items: list, ignore_case: bool) -> frozenset | None:
+    chars: frozenset | None = frozenset()
+    for op, av in items:
+        name = str(op)
+        if name == "NEGATE":
+            return None
+        if name == "LITERAL":
+            chars = _union(chars, _char(av, ignore_case))
+        elif name == "RANGE":
+            low, high = av
+            if high > 127:
+                chars = _union(chars, _char(high, ignore_case))
+            chars = _union(chars, *(_char(code, ignore_case) for code in range(low, min(high, 127) + 1)))
+        elif name == "CATEGORY" and str(av) in _CATEGORIES:
+            chars = _union(chars, _CATEGORIES[str(av)])
+        else:
+            return None
+    return chars
+
+
+def _profile(items: list, ignore_case: bool) -> tuple[frozenset | None, frozenset | None, bool]:
+    """``(first, alphabet, nullable)`` of a parsed pattern.
+
+    ``first`` holds the characters a match can start with, ``alphabet`` every
+    character a match can consume, and ``nullable`` whether it can match the
+    empty string. Unknown constructs widen the sets to "any character".
+    """
+    first: frozenset | None = frozenset()
+    alphabet: frozenset | None = frozenset()
+    nullable = True
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            item = (_char(av, ignore_case),) * 2 + (False,)
+        elif name == "IN":
+            chars = _char_class(av, ignore_case)
+            item = (chars, chars, False)
+        elif name in {"AT", "ASSERT", "ASSERT_NOT"}:
+            item = (frozenset(), frozenset(), True)
+        elif name == "SUBPATTERN":
+            add_flags = av[1] or 0
+            item = _profile(list(av[-1]), ignore_case or bool(add_flags & re.IGNORECASE))
+        elif name == "ATOMIC_GROUP":
+            item = _profile(list(av), ignore_case)
+        elif name in {"MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"}:
+            minimum, _, sub = av
+            sub_first, sub_alphabet, sub_nullable = _profile(list(sub), ignore_case)
+            item = (sub_first, sub_alphabet, minimum == 0 or sub_nullable)
+        elif name == "BRANCH":
+            branches = [_profile(list(branch), ignore_case) for branch in av[1]]
+            item = (
+                _union(*(branch[0] for branch in branches)),
+                _union(*(branch[1] for branch in branches)),
+                any(branch[2] for branch in branches),
+            )
+        else:
+            item = (None, None, False)
+        if nullable:
+            first = _union(first, item[0])
+        alphabet = _union(alphabet, item[1])
+        nullable = nullable and item[2]
+    return first, alphabet, nullable
+
+
+def _may_overlap(a: tuple, b: tuple) -> bool:
+    """Whether a match of one pattern could start at or inside a match of the other."""
+    (first_a, alphabet_a, nullable_a), (first_b, alphabet_b, nullable_b) = a, b
+    if nullable_a or nullable_b:
+        return True
+    for first, alphabet in ((first_a, alphabet_b), (first_b, alphabet_a)):
+        if first is None or alphabet is None or first & alphabet:
+            return True
+    return False
+
+
+def _disjoint_groups(items: tuple[tuple[str, str], ...], flags: int) -> list[list[int]]:
+    """Partition pattern indexes into groups whose matches can never overlap."""
+    profiles = []
+    for _, regex in items:
+        try:
+            unsafe = bool(_BACKREFERENCE.search(regex))
+            parsed = sre_parse.parse(regex, flags)
+            profiles.append(None if unsafe or parsed.state.flags & ~(flags | re.UNICODE) else _profile(list(parsed), bool(flags & re.IGNORECASE)))
+        except (re.error, RecursionError):
+            profiles.append(None)
+    groups: list[list[int]] = []
+    for index, profile in enumerate(profiles):
+        if profile is not None:
+            for group in groups:
+                if all(profiles[other] is not None and not _may_overlap(profile, profiles[other]) for other in group):
+                    group.append(index)
+                    break
+            else:
+                groups.append([index])
+        else:
+            groups.append([index])
+    return groups
+
+
+@lru_cache(maxsize=None)
+def combined_pattern(items: tuple[tuple[str, str], ...], flags: int) -> tuple[re.Pattern | None, dict[str, str]]:
+    """Join every pattern into one named-group alternation, compiled once per process.
+
+    Returns ``(None, {})`` when the set cannot be combined safely (backreferences,
+    inline global flags).
+    """
+    if not items or any(_BACKREFERENCE.search(regex) for _, regex in items):
+        return None, {}
+    groups = {f"_c4a_p{index}": label for index, (label, _) in enumerate(items)}
+    alternation = "|".join(f"(?P<{group}>{regex})" for group, (_, regex) in zip(groups, items))
+    try:
+        return re.compile(alternation, flags), groups
+    except re.error:
+        return None, {}
+
+
+@lru_cache(maxsize=None)
+def scan_plan(items: tuple[tuple[str, str], ...], flags: int) -> tuple[tuple[re.Pattern, str | dict[str, str]], ...]:
+    """Scans that reproduce one ``finditer`` per pattern, with non-overlapping patterns merged.
+
+    Patterns are only combined when no match of one can start at or inside a
+    match of another, so the first-listed-wins rule of an alternation never
+    hides a match. Overlapping, nullable or backreferencing patterns keep a
+    scan of their own. Each entry pairs a scanner with either its one label or
+    a group-name-to-label map for a combined scanner.
+    """
+    plan = []
+    for group in _disjoint_groups(items, flags):
+        members = tuple(items[index] for index in group)
+        combined, labels = combined_pattern(members, flags) if len(members) > 1 else (None, {})
+        if combined is None:
+            plan.extend((re.compile(regex, flags), label) for label, regex in members)
+        else:
+            plan.append((combined, labels))
+    return tuple(plan)
+
+
+class OnePassRegexStrategy(RegexExtractionStrategy):
+    """RegexExtractionStrategy that scans each document once per group of non-overlapping patterns.
+
+    Output is identical to the stock strategy, item for item and in the same
+    order; only the number of passes over the document shrinks.
+    """
+
+    def __init__(self, pattern: Any = None, *, custom: dict[str, str] | None = None, **kwargs: Any):
+        if pattern is None:
+            super().__init__(custom=custom, **kwargs)
+        else:
+            super().__init__(pattern, custom=custom, **kwargs)
+        # The stock strategy has already merged built-ins and custom patterns into
+        # _compiled; reuse its regexes and flags so matches stay identical
+        items = tuple((label, compiled.pattern) for label, compiled in self._compiled.items())
+        self._plan = scan_plan(items, self._FLAGS)
+        self._order = {label: index for index, label in enumerate(self._compiled)}
+
+    def extract(self, url: str, content: str, *q: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        found: list[tuple[int, int, dict[str, Any]]] = []
+        for scanner, labels in self._plan:
+            for match in scanner.finditer(content):
+                label = labels if isinstance(labels, str) else labels[match.lastgroup]
+                item = {"url": url, "label": label, "value": match.group(0), "span": [match.start(), match.end()]}
+                found.append((self._order[label], match.start(), item))
+        # Stock order: every match of the first pattern, then the second, ...
+        found.sort(key=lambda entry: entry[:2])
+        return [item for _, _, item in found]
+
+
+@dataclass
+class PatternSet:
+    name: str
+    patterns: dict[str, str]
+    source: str = "manual"
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def version(self) -> str:
+        return pattern_version(self.patterns)
+
+    def strategy(self, **kwargs: Any) -> OnePassRegexStrategy:
+        return OnePassRegexStrategy(custom=self.patterns, **kwargs)
+
+
+class PatternRegistry:
+    """Named pattern sets stored as JSON under PATTERN_CACHE_DIR.
+
+    Each file records the set's version hash, so re-registering identical
+    patterns is a no-op and LLM-generated sets are produced only once.
+    """
+
+    def __init__(self, root: Path = PATTERN_CACHE_DIR):
+        self.root = root
+
+    def path(self, name: str) -> Path:
+        return self.root / f"{name}.json"
+
+    def names(self) -> list[str]:
+        return sorted(path.stem for path in self.root.glob("*.json"))
+
+    def load(self, name: str) -> PatternSet | None:
+        try:
+            data = json.loads(self.path(name).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        return PatternSet(
+            name=data["name"],
+            patterns=data["patterns"],
+            source=data.get("source", "manual"),
+            created_at=data.get("created_at", 0.0),
+        )
+
+    def save(self, pattern_set: PatternSet) -> PatternSet:
+        self.root.mkdir(parents=True, exist_ok=True)
+        record = {
+            "name": pattern_set.name,
+            "version": pattern_set.version,
+            "source": pattern_set.source,
+            "created_at": pattern_set.created_at,
+            "patterns": pattern_set.patterns,
+        }
+        path = self.path(pattern_set.name)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(record, indent=2, ensure_ascii=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return pattern_set
+
+    def register(self, name: str, patterns: dict[str, str], source: str = "manual") -> PatternSet:
+        """Store ``patterns`` under ``name`` unless the saved set already has the same version."""
+        existing = self.load(name)
+        if existing is not None and existing.version == pattern_version(patterns):
+            return existing
+        return self.save(PatternSet(name=name, patterns=dict(patterns), source=source))
+
+    def generate(self, name: str, label: str, html: str, query: str, llm_config: Any) -> PatternSet:
+        """Return the saved set for ``name``, asking the LLM for a pattern only on first use."""
+        existing = self.load(name)
+        if existing is not None:
+            return existing
+        patterns = RegexExtractionStrategy.generate_pattern(label=label, html=html, query=query, llm_config=llm_config)
+        if isinstance(patterns, str):
+            patterns = json.loads(patterns)
+        return self.register(name, patterns, source="llm")
@@ -0,0 +1,128 @@
+"""Warm, shared AsyncWebCrawler instances for the tutorial series."""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import os
+import signal
+import sys
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Coroutine, TypeVar
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+T = TypeVar("T")
+
+# One started crawler per distinct BrowserConfig, all bound to the loop that started them
+_POOL: dict[str, AsyncWebCrawler] = {}
+_LOCKS: dict[str, asyncio.Lock] = {}
+_LOOP: asyncio.AbstractEventLoop | None = None
+# Crawlers left behind when their loop ended without close_pool(); reaped on the next loop
+_ORPHANS: list[AsyncWebCrawler] = []
+ORPHAN_CLOSE_TIMEOUT = 5.0
+
+
+def config_key(config: BrowserConfig | None) -> str:
+    """Stable key for a BrowserConfig so equal configs share one browser."""
+    if config is None:
+        return "default"
+    return json.dumps(config.to_dict(), sort_keys=True, default=str)
+
+
+def _bind_loop() -> None:
+    # Playwright objects cannot outlive their event loop. If a previous loop ended
+    # without close_pool(), its browsers are already unusable, so start over and
+    # keep the old crawlers around until their browsers are shut down.
+    global _LOOP
+    loop = asyncio.get_running_loop()
+    if _LOOP is not loop:
+        if _POOL:
+            print(
+                f"Crawler pool: {len(_POOL)} browser(s) outlived their event loop (asyncio.run without run()?); "
+                "shutting them down",
+                file=sys.stderr,
+            )
+            _ORPHANS.extend(_POOL.values())
+        _POOL.clear()
+        _LOCKS.clear()
+        _LOOP = loop
+
+
+def _kill_browser(crawler: AsyncWebCrawler) -> None:
+    # Chromium exits once the Playwright driver holding its pipe is gone; managed
+    # (CDP) browsers are separate processes and are killed directly
+    manager = getattr(crawler.crawler_strategy, "browser_manager", None)
+    managed = getattr(manager, "managed_browser", None)
+    with suppress(Exception):
+        managed.browser_process.kill()
+    with suppress(Exception):
+        driver = manager.playwright._impl_obj._connection._transport._proc
+        os.kill(driver.pid, signal.SIGKILL)
+
+
+async def _reap_orphans() -> None:
+    # Best effort: a clean close usually fails once the old loop is gone, so the
+    # processes are killed either way
+    while _ORPHANS:
+        crawler = _ORPHANS.pop()
+        with suppress(Exception):
+            await asyncio.wait_for(crawler.close(), ORPHAN_CLOSE_TIMEOUT)
+        _kill_browser(crawler)
+
+
+async def get_crawler(config: BrowserConfig | None = None) -> AsyncWebCrawler:
+    """Return the warm crawler for ``config``, launching the browser on first use only."""
+    _bind_loop()
+    await _reap_orphans()
+    key = config_key(config)
+    lock = _LOCKS.setdefault(key, asyncio.Lock())
+    async with lock:
+        crawler = _POOL.get(key)
+        if crawler is None:
+            crawler = AsyncWebCrawler(config=config) if config is not None else AsyncWebCrawler()
+            await crawler.start()
+            _POOL[key] = crawler
+    return crawler
+
+
+@asynccontextmanager
+async def shared_crawler(config: BrowserConfig | None = None) -> AsyncIterator[AsyncWebCrawler]:
+    """Drop-in replacement for ``async with AsyncWebCrawler(config=...)``.
+
+    Leaving the block keeps the browser running for the next caller; the pool is
+    shut down by ``run()`` (or at interpreter exit) instead.
+    """
+    yield await get_crawler(config)
+
+
+async def close_pool() -> None:
+    """Close every pooled crawler on the current loop."""
+    crawlers = list(_POOL.values())
+    _POOL.clear()
+    _LOCKS.clear()
+    await _reap_orphans()
+    for crawler in crawlers:
+        await crawler.close()
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """``asyncio.run()`` that closes the pool before the loop goes away."""
+
+    async def runner() -> T:
+        try:
+            return await main
+        finally:
+            await close_pool()
+
+    return asyncio.run(runner())
+
+
+@atexit.register
+def _close_at_exit() -> None:
+    # Safety net for callers that drive their own loop instead of using run()
+    if _POOL and _LOOP is not None and not _LOOP.is_closed() and not _LOOP.is_running():
+        _LOOP.run_until_complete(close_pool())
+    # Whatever is left lost its loop: close() can no longer run, so kill the browsers
+    for crawler in [*_ORPHANS, *_POOL.values()]:
+        _kill_browser(crawler)
@@ -0,0 +1,148 @@
+"""Generated extraction schemas cached per (domain, page template, query), validated before reuse."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from crawl4ai import JsonCssExtractionStrategy
+
+from c4a_series.common.io import SCHEMA_CACHE_DIR
+from c4a_series.common.templates import template_fingerprint
+
+# Regenerate a cached schema once fewer than this share of its fields come back filled
+DEFAULT_MIN_FILL_RATE = 0.6
+
+
+def fill_rate(schema: dict[str, Any], items: list[dict[str, Any]]) -> float:
+    """Share of (item, field) cells that came back non-empty; 0.0 when nothing matched."""
+    fields = [field["name"] for field in schema.get("fields", []) if "name" in field]
+    if not fields or not items:
+        return 0.0
+    filled = sum(1 for item in items for name in fields if item.get(name) not in (None, "", [], {}))
+    return filled / (len(items) * len(fields))
+
+
+def measure_fill_rate(schema: dict[str, Any], html: str, url: str = "") -> float:
+    """Run ``schema`` over ``html`` locally (no crawl, no LLM) and return its fill rate."""
+    items = JsonCssExtractionStrategy(schema, verbose=False).run(url, [html])
+    return fill_rate(schema, items)
+
+
+@dataclass
+class SchemaLookup:
+    schema: dict[str, Any]
+    fill_rate: float
+    status: str  # "cached", "generated" or "regenerated"
+    path: Path
+
+
+class SchemaStore:
+    """Schemas on disk under SCHEMA_CACHE_DIR/<domain>/<template>-<query>.json.
+
+    Files are re-read whenever their mtime changes, so a long-running worker
+    picks up a schema regenerated by another process without restarting.
+    """
+
+    def __init__(self, root: Path = SCHEMA_CACHE_DIR, min_fill_rate: float = DEFAULT_MIN_FILL_RATE):
+        self.root = root
+        self.min_fill_rate = min_fill_rate
+        self._loaded: dict[Path, tuple[float, dict[str, Any]]] = {}
+        self._strategies: dict[Path, tuple[float, JsonCssExtractionStrategy]] = {}
+
+    def path(self, domain: str, fingerprint: str, query: str) -> Path:
+        query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+        return self.root / domain / f"{fingerprint}-{query_hash}.json"
+
+    def load(self, path: Path) -> dict[str, Any] | None:
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            self._loaded.pop(path, None)
+            return None
+        cached = self._loaded.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            # Mid-write by another process: keep serving the previous copy until it parses
+            return cached[1] if cached is not None else None
+        self._loaded[path] = (mtime, record)
+        return record
+
+    def save(self, path: Path, record: dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(record, indent=2, ensure_ascii=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+        self._loaded[path] = (path.stat().st_mtime, record)
+
+    def strategy(self, path: Path) -> JsonCssExtractionStrategy | None:
+        """Ready-built strategy for a stored schema, rebuilt only when its file changes."""
+        record = self.load(path)
+        if record is None:
+            return None
+        mtime = self._loaded[path][0]
+        cached = self._strategies.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, JsonCssExtractionStrategy(record["schema"], verbose=False))
+            self._strategies[path] = cached
+        return cached[1]
+
+    async def get_or_generate(
+        self,
+        url: str,
+        html: str,
+        query: str,
+        llm_config: Any,
+        sample: str | None = None,
+        schema_type: str = "CSS",
+        fingerprint: str | None = None,
+    ) -> SchemaLookup:
+        """Return a schema for this page, calling the LLM only when none fits.
+
+        A cached schema is re-validated against ``html`` on every lookup. It is
+        reused while its fill rate stays at or above ``min_fill_rate``; below
+        that the page has drifted and the schema is regenerated from
+        ``sample`` (defaults to ``html``). Pass a TemplateIndex cluster id as
+        ``fingerprint`` to share one schema across every page of a template.
+        """
+        domain = urlparse(url).netloc or "local"
+        fingerprint = fingerprint or template_fingerprint(html)
+        path = self.path(domain, fingerprint, query)
+
+        record = self.load(path)
+        status = "generated"
+        if record is not None:
+            rate = await asyncio.to_thread(measure_fill_rate, record["schema"], html, url)
+            if rate >= self.min_fill_rate:
+                return SchemaLookup(record["schema"], rate, "cached", path)
+            status = "regenerated"
+
+        schema = await asyncio.to_thread(
+            JsonCssExtractionStrategy.generate_schema,
+            html=sample or html,
+            schema_type=schema_type,
+            query=query,
+            llm_config=llm_config,
+        )
+        rate = await asyncio.to_thread(measure_fill_rate, schema, html, url)
+        self.save(
+            path,
+            {
+                "domain": domain,
+                "fingerprint": fingerprint,
+                "query": query,
+                "schema": schema,
+                "fill_rate": rate,
+                "generated_at": time.time(),
+            },
+        )
+        return SchemaLookup(schema, rate, status, path)
@@ -0,0 +1,179 @@
+"""Cluster pages by DOM template with MinHash over tag-path shingles."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import zlib
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from c4a_series.common.io import SCHEMA_CACHE_DIR
+
+TEMPLATE_INDEX_FILE = SCHEMA_CACHE_DIR / "templates.json"
+
+# Consecutive tag paths per shingle, and how many ancestors each path keeps
+SHINGLE_SIZE = 3
+PATH_DEPTH = 4
+
+# 64 MinHash permutations split into 16 LSH bands of 4 rows: pages with a
+# Jaccard similarity around 0.5 or more almost always share at least one band
+NUM_PERM = 64
+BANDS = 16
+DEFAULT_THRESHOLD = 0.6
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)  # Fixed seed so signatures are comparable across runs
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# Text-only tags carry no template structure; their whole subtree is skipped
+_IGNORED_TAGS = frozenset({"script", "style", "noscript", "svg", "br", "wbr"})
+
+# Template structure repeats, so the first elements of a page already carry its
+# vocabulary; capping the walk bounds the cost on very large pages
+MAX_ELEMENTS = 1024
+
+
+def tag_path_ids(document: str | Any) -> list[int]:
+    """crc32 of every element's ancestor path (e.g. ``body/div.card/h2``) in document order.
+
+    Accepts raw HTML or an lxml tree the caller has already parsed, which
+    skips the parse entirely. Text and attribute values other than the first
+    class name are ignored.
+    """
+    if isinstance(document, str):
+        if not document.strip():
+            return []
+        try:
+            document = lxml_html.document_fromstring(document)
+        except (etree.ParserError, ValueError):
+            return []
+    known: dict[tuple[str, ...], int] = {}
+    stack: list[str] = []
+    ids: list[int] = []
+    walker = etree.iterwalk(document, events=("start", "end"))
+    for event, element in walker:
+        if event == "end":
+            stack.pop()
+            continue
+        tag = element.tag
+        if not isinstance(tag, str) or tag in _IGNORED_TAGS:
+            # Comments, processing instructions and text-only subtrees; the
+            # placeholder is popped again by this element's own "end" event
+            walker.skip_subtree()
+            stack.append("")
+            continue
+        classes = (element.get("class") or "").split()
+        node = f"{tag}.{classes[0]}" if classes else tag
+        key = (*stack[-(PATH_DEPTH - 1) :], node)
+        path_id = known.get(key)
+        if path_id is None:
+            path_id = known[key] = zlib.crc32("/".join(key).encode("utf-8"))
+        ids.append(path_id)
+        if len(ids) >= MAX_ELEMENTS:
+            break
+        stack.append(node)
+    return ids
+
+
+def tag_path_shingles(document: str | Any) -> set[int]:
+    """Hashed k-shingles of consecutive tag paths — the page's structural vocabulary."""
+    ids = tag_path_ids(document)
+    if not ids:
+        return set()
+    # crc32 over each window of packed path ids; stable across processes unlike hash()
+    packed = memoryview(array("I", ids).tobytes())
+    width = 4 * min(SHINGLE_SIZE, len(ids))
+    return {zlib.crc32(packed[start : start + width]) for start in range(0, len(packed) - width + 1, 4)}
+
+
+def template_fingerprint(document: str | Any) -> str:
+    """Short hash of a page's tag/class structure, independent of its text."""
+    shingles = sorted(tag_path_shingles(document))
+    return hashlib.sha1(",".join(map(str, shingles)).encode("ascii")).hexdigest()[:12]
+
+
+def minhash(shingles: set[int]) -> tuple[int, ...]:
+    if not shingles:
+        return (0,) * NUM_PERM
+    return tuple(min((a * x + b) % _PRIME for x in shingles) for a, b in _PERMUTATIONS)
+
+
+def similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the two pages' shingle sets."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+@dataclass
+class TemplateCluster:
+    cluster_id: str
+    signature: tuple[int, ...]
+    size: int = 1
+    example_url: str = ""
+
+
+class TemplateIndex:
+    """Assigns pages to template clusters, persisted next to the schema cache.
+
+    Each cluster keeps only the signature of its first page, so lookups cost
+    one MinHash plus a handful of band-bucket probes regardless of how many
+    pages have been seen.
+    """
+
+    def __init__(self, path: Path = TEMPLATE_INDEX_FILE, threshold: float = DEFAULT_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.clusters: dict[str, TemplateCluster] = {}
+        self._buckets: dict[tuple[int, int], list[str]] = {}
+        try:
+            records = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            records = []
+        for record in records:
+            cluster = TemplateCluster(**{**record, "signature": tuple(record["signature"])})
+            self._add(cluster)
+
+    def _bands(self, signature: tuple[int, ...]) -> list[tuple[int, int]]:
+        rows = len(signature) // BANDS
+        return [(band, hash(signature[band * rows : (band + 1) * rows])) for band in range(BANDS)]
+
+    def _add(self, cluster: TemplateCluster) -> None:
+        self.clusters[cluster.cluster_id] = cluster
+        for key in self._bands(cluster.signature):
+            self._buckets.setdefault(key, []).append(cluster.cluster_id)
+
+    def match(self, signature: tuple[int, ...]) -> tuple[TemplateCluster | None, float]:
+        """Best existing cluster sharing an LSH band with ``signature``, and its similarity."""
+        candidates = {cluster_id for key in self._bands(signature) for cluster_id in self._buckets.get(key, ())}
+        best, best_score = None, 0.0
+        for cluster_id in candidates:
+            score = similarity(signature, self.clusters[cluster_id].signature)
+            if score > best_score:
+                best, best_score = self.clusters[cluster_id], score
+        return best, best_score
+
+    def assign(self, document: str | Any, url: str = "") -> TemplateCluster:
+        """Route a page (HTML or a parsed lxml tree) to its template cluster, opening a new one for unseen layouts."""
+        signature = minhash(tag_path_shingles(document))
+        cluster, score = self.match(signature)
+        if cluster is not None and score >= self.threshold:
+            cluster.size += 1
+            return cluster
+        cluster_id = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:12]
+        cluster = self.clusters.get(cluster_id) or TemplateCluster(cluster_id, signature, 0, url)
+        cluster.size += 1
+        if cluster_id not in self.clusters:
+            self._add(cluster)
+        return cluster
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps([asdict(cluster) for cluster in self.clusters.values()]), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+############################# Path Configuration #############################
+
+# When running this script directly (e.g., `python reextract.py`), __package__
+# will be None or empty. In that case, add the project root (one level up) to
+# sys.path so that the c4a_series package imports resolve correctly.
+if __package__ in {None, ""}:
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
+from crawl4ai.content_filter_strategy import BM25ContentFilter, PruningContentFilter
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+from c4a_series.common.extraction import CompiledCssExtractionStrategy
+from c4a_series.common.io import RUNS_DIR, fit_markdown, raw_markdown
+from c4a_series.common.pool import run, shared_crawler
+
+# Every archived page is a directory holding the raw.html an episode saved
+ARCHIVE_FILE = "raw.html"
+
+############################# Archive Helpers ################################
+
+
+def iter_archives(root: Path) -> list[Path]:
+    return sorted(path.parent for path in root.rglob(ARCHIVE_FILE))
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` unless the file already holds exactly these bytes."""
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+    return True
+
+
+def build_config(schema: Path | None, pruning: float | None, bm25: str | None) -> CrawlerRunConfig:
+    """Run config applied to every archived page; stream=True yields results as they finish."""
+    content_filter = None
+    if pruning is not None:
+        content_filter = PruningContentFilter(threshold=pruning, threshold_type="dynamic")
+    elif bm25:
+        content_filter = BM25ContentFilter(user_query=bm25)
+    strategy = None
+    if schema is not None:
+        strategy = CompiledCssExtractionStrategy(json.loads(schema.read_text(encoding="utf-8")), verbose=False)
+    return CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        markdown_generator=DefaultMarkdownGenerator(content_filter=content_filter),
+        extraction_strategy=strategy,
+        stream=True,
+        verbose=False,
+    )
+
+
+def outputs_for(result, config: CrawlerRunConfig) -> dict[str, str]:
+    outputs = {"raw.md": raw_markdown(result.markdown)}
+    if config.markdown_generator.content_filter is not None:
+        outputs["fit.md"] = fit_markdown(result.markdown)
+    if config.extraction_strategy is not None:
+        items = json.loads(result.extracted_content or "[]")
+        outputs["extracted.json"] = json.dumps(items, indent=2, ensure_ascii=True)
+    return outputs
+
+
+############################# Re-extraction Run ##############################
+
+
+async def reextract(archives: list[Path], config: CrawlerRunConfig, concurrency: int, batch_size: int) -> dict[str, int]:
+    """Re-run markdown generation and extraction over the given archive directories.
+
+    Pages go back through Crawl4AI as raw:// URLs, which skip the browser and
+    the network entirely, so the run is bound by CPU.  Archives are read in
+    batches so only ``batch_size`` documents are held in memory, results are
+    streamed back as each page finishes, and an output file is rewritten only
+    when its content actually changed.
+    """
+    stats = {"pages": 0, "written": 0, "unchanged": 0, "failed": 0}
+    async with shared_crawler() as crawler:
+        for start in range(0, len(archives), batch_size):
+            # Identical archived pages are processed once and written to every copy
+            targets: dict[str, list[Path]] = {}
+            for directory in archives[start : start + batch_size]:
+                html = (directory / ARCHIVE_FILE).read_text(encoding="utf-8")
+                targets.setdefault(f"raw://{html}", []).append(directory)
+
+            dispatcher = MemoryAdaptiveDispatcher(memory_threshold_percent=80.0, max_session_permit=concurrency)
+            async for result in await crawler.arun_many(urls=list(targets), config=config, dispatcher=dispatcher):
+                directories = targets.get(result.url, [])
+                stats["pages"] += len(directories)
+                if not result.success:
+                    stats["failed"] += len(directories)
+                    for directory in directories:
+                        print("failed:", directory, result.error_message)
+                    continue
+                outputs = outputs_for(result, config)
+                for directory in directories:
+                    for name, text in outputs.items():
+                        changed = await asyncio.to_thread(write_if_changed, directory / name, text)
+                        stats["written" if changed else "unchanged"] += 1
+    return stats
+
+
+def _reextract_worker(archives: list[Path], options: dict) -> dict[str, int]:
+    # Each worker process builds its own config and crawler; strategies are not picklable
+    config = build_config(options["schema"], options["pruning"], options["bm25"])
+    return run(reextract(archives, config, options["concurrency"], options["batch_size"]))
+
+
+def reextract_parallel(root: Path, workers: int, **options) -> dict[str, int]:
+    """Split the archives across ``workers`` processes, each with its own crawler.
+
+    Crawl4AI scrapes raw:// pages on the event loop thread, so a single
+    process only interleaves pages on one core; separate processes are what
+    spread the parsing, markdown and extraction work over every core.
+    """
+    archives = iter_archives(root)
+    stats = {"pages": 0, "written": 0, "unchanged": 0, "failed": 0}
+    if not archives:
+        return stats
+    workers = max(1, min(workers, len(archives)))
+    if workers == 1:
+        return _reextract_worker(archives, options)
+    # Strided slices keep every worker's share the same size and mix of directories
+    shares = [archives[index::workers] for index in range(workers)]
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        for share_stats in pool.map(_reextract_worker, shares, [options] * workers):
+            for key, value in share_stats.items():
+                stats[key] += value
+    return stats
+
+
+################################# Entry Point ################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-apply markdown and extraction strategies to archived raw HTML.")
+    parser.add_argument("root", nargs="?", type=Path, default=RUNS_DIR, help="Archive root to scan for raw.html files.")
+    parser.add_argument("--schema", type=Path, help="JsonCss schema file; writes extracted.json next to each page.")
+    parser.add_argument("--pruning", type=float, help="PruningContentFilter threshold; writes fit.md.")
+    parser.add_argument("--bm25", help="BM25ContentFilter query; writes fit.md.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Pages in flight per worker (default: 8).")
+    parser.add_argument("--batch-size", type=int, default=64, help="Archived pages held in memory per worker (default: 64).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count).")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stats = reextract_parallel(
+        args.root,
+        args.workers,
+        schema=args.schema,
+        pruning=args.pruning,
+        bm25=args.bm25,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"{stats['pages']} pages in {elapsed:.1f}s ({stats['pages'] / elapsed if elapsed else 0:.1f}/s): "
+        f"{stats['written']} written, {stats['unchanged']} unchanged, {stats['failed']} failed"
+    )
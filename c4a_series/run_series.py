@@ -0,0 +1,49 @@
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+############################# Path Configuration #############################
+
+# When running this script directly (e.g., `python run_series.py`), __package__
+# will be None or empty. In that case, add the project root (one level up) to
+# sys.path so that the c4a_series package imports resolve correctly.
+if __package__ in {None, ""}:
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from c4a_series.common.pool import run
+
+# Every episode module in playback order, discovered from the videos package
+EPISODES = sorted(path.stem for path in (Path(__file__).resolve().parent / "videos").glob("v[0-9][0-9]_*.py"))
+
+############################## Series Runner #################################
+
+
+async def run_episodes(names: list[str]) -> None:
+    """Run each episode's main() back-to-back on one event loop.
+
+    All episodes borrow their browsers from the shared crawler pool, so Chromium
+    is launched once per distinct BrowserConfig for the whole series instead of
+    once per episode.  A failing episode is reported and the run continues.
+    """
+    for name in names:
+        module = importlib.import_module(f"c4a_series.videos.{name}")
+        print(f"\n=== {name} ===")
+        started = time.perf_counter()
+        try:
+            await module.main()
+        except Exception as exc:
+            print(f"{name} failed: {exc}")
+        print(f"--- {name} finished in {time.perf_counter() - started:.1f}s")
+
+
+################################# Entry Point ################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Crawl4AI tutorial episodes with one shared browser pool.")
+    parser.add_argument("episodes", nargs="*", help="Episode prefixes to run, e.g. v01 v04 (default: all).")
+    args = parser.parse_args()
+
+    selected = [name for name in EPISODES if not args.episodes or name.split("_", 1)[0] in args.episodes]
+    run(run_episodes(selected))
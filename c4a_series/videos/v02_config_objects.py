@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -12,6 +11,8 @@ if __package__ in {None, ""}:
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig
 
+from c4a_series.common.pool import run, shared_crawler
+
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
 
@@ -77,7 +78,7 @@ async def main() -> None:
     # Open a single browser session and reuse it for both crawl profiles.
     # AsyncWebCrawler accepts a BrowserConfig directly — no need to pass it
     # again to individual arun() calls.
-    async with AsyncWebCrawler(config=browser_config) as crawler:
+    async with shared_crawler(browser_config) as crawler:
         # Run the fast profile first — quick baseline fetch
         await run_once(crawler, "fast", fast_run)
 
@@ -87,7 +88,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,3 @@
-import asyncio
 import sys
 import time
 from pathlib import Path
@@ -13,6 +12,8 @@ if __package__ in {None, ""}:
 
 from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
 
+from c4a_series.common.pool import run, shared_crawler
+
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
 
@@ -77,7 +78,7 @@ async def main() -> None:
     # Open a single browser session and reuse it across all three crawls.
     # Sharing the session avoids the overhead of launching a new headless
     # browser for each call, keeping the timing comparison fair.
-    async with AsyncWebCrawler() as crawler:
+    async with shared_crawler() as crawler:
 
         # First crawl: ENABLED mode — this will hit the network because the
         # cache is cold (or stale), then store the result for future reads.
@@ -96,7 +97,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context.
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down.
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
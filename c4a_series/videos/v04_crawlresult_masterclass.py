@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,9 +9,10 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai import CacheMode, CrawlerRunConfig
 
-from c4a_series.common.io import episode_dir, fit_markdown, raw_markdown, write_text
+from c4a_series.common.io import cached_arun, episode_dir, fit_markdown, raw_markdown, write_text
+from c4a_series.common.pool import run, shared_crawler
 
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
@@ -45,12 +45,13 @@ async def main() -> None:
         verbose=False,
     )
 
-    # Launch an async crawler session using a context manager, which handles
-    # browser startup and teardown (Crawl4AI uses a headless browser under the hood)
-    async with AsyncWebCrawler() as crawler:
+    # Borrow a warm crawler from the shared pool — the browser (Crawl4AI uses a
+    # headless browser under the hood) is launched once and reused across episodes
+    async with shared_crawler() as crawler:
         # Perform the actual crawl — arun() fetches the page, renders any
         # JavaScript, and populates the CrawlResult with all extracted content
-        result = await crawler.arun(url=URL, config=config)
+        # cached_arun() answers from the on-disk result cache when C4A_RESULT_CACHE=1
+        result = await cached_arun(crawler, URL, config)
 
     # Report whether the crawl succeeded and what HTTP status code was returned;
     # status_code may be absent on certain error paths so we use getattr safely
@@ -105,7 +106,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,11 +9,12 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
 from crawl4ai.content_filter_strategy import BM25ContentFilter, PruningContentFilter
 from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 
+from c4a_series.common.fanout import StrategyRun, fan_out
 from c4a_series.common.io import fit_markdown, preview, raw_markdown
+from c4a_series.common.pool import run
 
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
@@ -22,49 +22,43 @@ URL = "https://docs.crawl4ai.com/"
 ########################## Filter Comparison Helper ##########################
 
 
-async def compare_filter(label: str, generator: DefaultMarkdownGenerator) -> None:
-    """Crawl the target URL using the given markdown generator and print a size comparison.
+def report_filter(label: str, filter_run: StrategyRun) -> None:
+    """Print a size comparison for one generator's output on the shared page.
 
-    Runs a single crawl with the supplied generator (which wraps a content
-    filter), then reports three values side-by-side:
+    Reports three values side-by-side:
       - raw:  character count of the unfiltered markdown
       - fit:  character count of the filtered (fit) markdown
       - preview: the first 160 characters of the fit output
 
     This makes it easy to see at a glance how aggressively each filter
-    trims the page content.
+    trims the page content, and how long the filter itself took once the
+    page was already in hand.
 
     Args:
-        label:     A short identifier printed before each result line (e.g. "pruning" or "bm25").
-        generator: A DefaultMarkdownGenerator configured with a specific content filter.
+        label: A short identifier printed before each result line (e.g. "pruning" or "bm25").
+        filter_run: The generator's output and timing from fan_out().
     """
-    # Attach the generator to the run config so Crawl4AI uses the chosen
-    # filter strategy when converting the crawled HTML to markdown
-    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, markdown_generator=generator, verbose=False)
-
-    # Launch an async crawler session — the context manager handles headless
-    # browser startup and teardown automatically
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(url=URL, config=config)
-
-    # Guard against network errors or other crawl failures before touching
-    # the result payload
-    if not result.success:
-        print(label, "failed:", result.error_message)
-        return
-
     # raw_markdown() returns the full, unfiltered markdown produced from the
     # crawled page — everything Crawl4AI extracted before any content filter ran
-    raw_text = raw_markdown(result.markdown)
+    raw_text = raw_markdown(filter_run.output)
 
     # fit_markdown() returns the filtered markdown — only the blocks that
     # survived the content filter attached to the generator.  Comparing its
     # length to raw_text shows how much the filter removed.
-    fit_text = fit_markdown(result.markdown)
-
-    # Print a one-line summary: label, raw size, fit size, and a short preview
-    # of the fit output so we can visually verify what was kept
-    print(label, "raw=", len(raw_text), "fit=", len(fit_text), "preview=", preview(fit_text, 160))
+    fit_text = fit_markdown(filter_run.output)
+
+    # Print a one-line summary: label, raw size, fit size, filter time, and a
+    # short preview of the fit output so we can visually verify what was kept
+    print(
+        label,
+        "raw=",
+        len(raw_text),
+        "fit=",
+        len(fit_text),
+        f"took={filter_run.seconds * 1000:.1f}ms",
+        "preview=",
+        preview(fit_text, 160),
+    )
 
 
 ################################# Main Routine ###############################
@@ -107,15 +101,26 @@ async def main() -> None:
         content_filter=BM25ContentFilter(user_query="installation quickstart browser config", bm25_threshold=1.0)
     )
 
-    # Run both filters against the same URL so the size and content differences
-    # are directly comparable in the printed output
-    await compare_filter("pruning", pruning)
-    await compare_filter("bm25", bm25)
+    # Fetch the page once and hand the same HTML to both generators — the
+    # browser round-trip is paid a single time, and the differences in the
+    # printed output come purely from the filters, never from the page changing
+    # between two separate crawls
+    fanned = await fan_out(URL, {"pruning": pruning, "bm25": bm25})
+
+    # Guard against network errors or other crawl failures before touching
+    # the result payload
+    if not fanned.result.success:
+        print("crawl failed:", fanned.result.error_message)
+        return
+
+    print(f"fetched once in {fanned.fetch_seconds:.2f}s")
+    for label, filter_run in fanned.runs.items():
+        report_filter(label, filter_run)
 
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
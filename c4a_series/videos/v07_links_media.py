@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,7 +9,9 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from c4a_series.common.pool import run, shared_crawler
 
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
@@ -85,7 +86,7 @@ async def main() -> None:
     Comparing the two summaries makes it easy to see how much external image
     and social-link clutter a typical documentation page carries.
     """
-    async with AsyncWebCrawler() as crawler:
+    async with shared_crawler() as crawler:
         # Base crawl — no filtering; captures the full set of links and media
         base = await crawler.arun(
             url=URL,
@@ -113,7 +114,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import sys
 from pathlib import Path
@@ -11,7 +10,9 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig, JsonCssExtractionStrategy
+from crawl4ai import CacheMode, CrawlerRunConfig, JsonCssExtractionStrategy
+
+from c4a_series.common.pool import run, shared_crawler
 
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
@@ -63,9 +64,9 @@ async def main() -> None:
     strategy = JsonCssExtractionStrategy(SCHEMA, verbose=False)
     config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, extraction_strategy=strategy, verbose=False)
 
-    # Launch an async crawler session using a context manager, which handles
-    # browser startup and teardown (Crawl4AI uses a headless browser under the hood)
-    async with AsyncWebCrawler() as crawler:
+    # Borrow a warm crawler from the shared pool — the browser (Crawl4AI uses a
+    # headless browser under the hood) is launched once and reused across episodes
+    async with shared_crawler() as crawler:
         # arun() fetches and renders the page, then applies the extraction
         # strategy — the structured output lands in result.extracted_content
         result = await crawler.arun(url=URL, config=config)
@@ -87,7 +88,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
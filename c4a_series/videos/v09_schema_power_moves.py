@@ -1,4 +1,3 @@
-import asyncio
 import json
 import sys
 from pathlib import Path
@@ -11,7 +10,10 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig, JsonCssExtractionStrategy
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from c4a_series.common.extraction import CompiledCssExtractionStrategy
+from c4a_series.common.pool import run, shared_crawler
 
 # Target URL — the Crawl4AI quickstart docs page used as our extraction subject
 URL = "https://docs.crawl4ai.com/core/quickstart/"
@@ -103,8 +105,11 @@ async def main() -> None:
     Prints the page title, total section count, and total code block count.
     """
     # Wire up the extraction strategy with our schema — verbose=False keeps
-    # the console output focused on our own print statements
-    strategy = JsonCssExtractionStrategy(SCHEMA, verbose=False)
+    # the console output focused on our own print statements.  The compiled
+    # variant is a drop-in JsonCssExtractionStrategy that translates every
+    # selector to XPath once and parses each page a single time with lxml, so
+    # reusing SCHEMA across many pages never re-interprets it.
+    strategy = CompiledCssExtractionStrategy(SCHEMA, verbose=False)
 
     # Build the crawler run config:
     # - BYPASS cache to always fetch the live page
@@ -114,7 +119,7 @@ async def main() -> None:
 
     # Launch the headless browser session, crawl the page, and let the
     # extraction strategy parse the DOM before returning the result
-    async with AsyncWebCrawler() as crawler:
+    async with shared_crawler() as crawler:
         result = await crawler.arun(url=URL, config=config)
 
     # Guard against network errors, timeouts, or selector mismatches before
@@ -138,7 +143,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to drive the async
-# main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
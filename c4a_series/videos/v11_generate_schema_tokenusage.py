@@ -1,5 +1,3 @@
-import asyncio
-import json
 import os
 import sys
 from pathlib import Path
@@ -13,42 +11,51 @@ if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from crawl4ai import (
-    AsyncWebCrawler,
     CacheMode,
     CrawlerRunConfig,
-    JsonCssExtractionStrategy,
     LLMConfig,
 )
 
-from c4a_series.common.io import SCHEMA_CACHE_DIR, load_env, write_json
+from c4a_series.common.io import load_env
+from c4a_series.common.pool import run, shared_crawler
+from c4a_series.common.schemas import SchemaLookup, SchemaStore
+from c4a_series.common.templates import TemplateIndex
 
-# Target URL — the Crawl4AI quickstart documentation page we want to extract
-# structured data from
-URL = "https://docs.crawl4ai.com/core/quickstart/"
+# Target URLs — Crawl4AI documentation pages that all share one docs template,
+# so a single generated schema should serve every one of them
+URLS = [
+    "https://docs.crawl4ai.com/core/quickstart/",
+    "https://docs.crawl4ai.com/core/browser-crawler-config/",
+    "https://docs.crawl4ai.com/core/markdown-generation/",
+    "https://docs.crawl4ai.com/core/fit-markdown/",
+]
 
-# Path where the LLM-generated schema will be cached on disk so we avoid
-# paying LLM API costs on every run (generate once, reuse forever)
-SCHEMA_FILE = SCHEMA_CACHE_DIR / "v11_quickstart_schema.json"
+# Plain-English description of the data we want; part of the schema cache key
+QUERY = "Extract the article title and major quickstart sections from this page."
 
-############################ HTML Sampling Helper ############################
+############################ Page Fetching Helper ############################
 
 
-async def fetch_sample_html() -> str:
-    """Fetch a truncated HTML snippet from the target URL for schema generation.
+async def fetch_pages() -> list:
+    """Crawl every target URL concurrently and return the successful results.
 
-    The LLM only needs a representative slice of the page to infer CSS selectors —
-    sending the full document would waste tokens and may exceed model context limits.
-    We cap the output at 12 000 characters, preferring cleaned HTML (boilerplate
-    removed) over the raw source when Crawl4AI makes it available.
+    Each result's full HTML is used twice: to route the page to its template
+    cluster and to run the cluster's schema locally.  Only the first page of a
+    new cluster is ever sampled for the LLM.
     """
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(
-            url=URL,
+    async with shared_crawler() as crawler:
+        results = await crawler.arun_many(
+            urls=URLS,
             config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS, verbose=False),
         )
-    if not result.success:
-        raise RuntimeError(result.error_message)
+    for result in results:
+        if not result.success:
+            print("failed:", result.url, result.error_message)
+    return [result for result in results if result.success]
 
+
+def llm_sample(result) -> str:
+    """Truncated HTML sent to the LLM when a cluster needs a (new) schema."""
     # Prefer cleaned_html (tags stripped, noise removed) so the LLM sees a
     # compact, signal-rich view of the page structure. Fall back to raw html
     # if cleaned_html is unavailable. Truncate to 12 000 chars to stay within
@@ -60,22 +67,29 @@ async def fetch_sample_html() -> str:
 
 
 async def main() -> None:
-    """Generate a CSS extraction schema via an LLM, then use it to scrape the page.
-
-    The workflow has two phases:
-
-    1. Schema generation (runs once):
-       - Fetch a sample of the page HTML.
-       - Pass it to JsonCssExtractionStrategy.generate_schema(), which sends
-         the HTML and a plain-English query to an LLM.  The LLM inspects the
-         markup and returns a JSON schema describing the CSS selectors and
-         field names needed to extract the requested data.
-       - Persist the schema to disk so future runs skip the LLM call entirely.
-
-    2. Extraction (runs every time):
-       - Load the cached schema and build a JsonCssExtractionStrategy from it.
-       - Run a fresh crawl of the page using that strategy to extract structured
-         JSON content — no LLM involved at this stage.
+    """Generate one CSS extraction schema per page template, then apply it to every page.
+
+    The workflow has three phases:
+
+    1. Template clustering:
+       - Each page's tag paths are shingled and MinHashed; the TemplateIndex
+         routes the page to the cluster of structurally similar pages it has
+         seen before (persisted across runs), or opens a new cluster.
+
+    2. Schema lookup (LLM only when needed, once per cluster):
+       - The SchemaStore keys schemas by (domain, cluster id, query).  A
+         cached schema is first run against the page's fresh HTML; if enough
+         of its fields still come back filled it is reused, with no LLM call.
+       - Otherwise JsonCssExtractionStrategy.generate_schema() sends a sample
+         of the HTML and the plain-English query to an LLM, which returns a
+         JSON schema of CSS selectors and field names.  The store persists it
+         so future runs — and other workers watching the same directory —
+         pick it up.
+
+    3. Extraction:
+       - Every page is handed to its cluster's ready-built
+         JsonCssExtractionStrategy and extracted locally — no second crawl
+         and no LLM involved at this stage.
     """
     # Load environment variables from a .env file (e.g., OPENAI_API_KEY)
     load_env()
@@ -87,47 +101,46 @@ async def main() -> None:
         print("OPENAI_API_KEY is required for schema generation.")
         return
 
-    # Ensure the schema cache directory exists before attempting to write to it
-    SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-    if SCHEMA_FILE.exists():
-        # Schema already generated on a previous run — load it from disk to
-        # avoid an unnecessary (and billable) LLM API call
-        schema = json.loads(SCHEMA_FILE.read_text(encoding="utf-8"))
-        print("using cached schema:", SCHEMA_FILE)
-    else:
-        # Ask the LLM to analyse a sample of the page HTML and produce a
-        # JSON schema containing CSS selectors for the requested fields.
-        # LLMConfig provider format: "<provider>/<model>" — here we use
-        # OpenAI's gpt-4o-mini, which balances quality and low token cost.
-        schema = JsonCssExtractionStrategy.generate_schema(
-            html=await fetch_sample_html(),
-            schema_type="CSS",
-            query="Extract the article title and major quickstart sections from this page.",
-            llm_config=LLMConfig(provider="openai/gpt-4o-mini", api_token=api_key),
-        )
-        # Persist the generated schema so subsequent runs skip the LLM step
-        write_json(SCHEMA_FILE, schema)
-        print("generated schema:", SCHEMA_FILE)
-
-    # Build an extraction strategy from the (possibly cached) schema — this
-    # applies the CSS selectors deterministically, with no further LLM calls
-    strategy = JsonCssExtractionStrategy(schema, verbose=False)
-
-    # Combine the extraction strategy with a fresh (non-cached) crawl config
-    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, extraction_strategy=strategy, verbose=False)
-
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(url=URL, config=config)
-
-    # Report crawl outcome and a short preview of the structured JSON payload
-    print("success:", result.success)
-    print("extracted preview:", (result.extracted_content or "")[:250])
+    # LLMConfig provider format: "<provider>/<model>" — here we use OpenAI's
+    # gpt-4o-mini, which balances quality and low token cost
+    llm_config = LLMConfig(provider="openai/gpt-4o-mini", api_token=api_key)
+
+    index = TemplateIndex()
+    store = SchemaStore()
+    lookups: dict[str, SchemaLookup] = {}
+
+    for result in await fetch_pages():
+        cluster = index.assign(result.html or "", result.url)
+
+        # Only the first page of each cluster pays for a lookup (and, when the
+        # cached schema is missing or its fill rate has decayed, one LLM call)
+        if cluster.cluster_id not in lookups:
+            lookup = await store.get_or_generate(
+                url=result.url,
+                html=result.html or "",
+                query=QUERY,
+                llm_config=llm_config,
+                sample=llm_sample(result),
+                fingerprint=cluster.cluster_id,
+            )
+            lookups[cluster.cluster_id] = lookup
+            print(f"{lookup.status} schema for cluster {cluster.cluster_id} (fill rate {lookup.fill_rate:.0%}):", lookup.path)
+
+        # The store hands back the same strategy object for every page of the
+        # cluster, so routing a page costs a MinHash and a dict lookup
+        strategy = store.strategy(lookups[cluster.cluster_id].path)
+        items = strategy.run(result.url, [result.html or ""])
+        print(f"{result.url} -> cluster {cluster.cluster_id}: {len(items)} items; preview {str(items)[:160]}")
+
+    # Persist cluster signatures so the next run routes pages without re-learning
+    index.save()
+    llm_calls = sum(1 for lookup in lookups.values() if lookup.status != "cached")
+    print(f"clusters: {len(lookups)}  LLM calls this run: {llm_calls}")
 
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import os
 import sys
@@ -14,9 +13,10 @@ from pydantic import BaseModel, Field
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig, LLMConfig, LLMExtractionStrategy
+from crawl4ai import CacheMode, CrawlerRunConfig, LLMConfig, LLMExtractionStrategy
 
 from c4a_series.common.io import load_env
+from c4a_series.common.pool import run, shared_crawler
 
 # Target URL — the Crawl4AI quickstart documentation page
 URL = "https://docs.crawl4ai.com/core/quickstart/"
@@ -100,7 +100,7 @@ async def main() -> None:
 
     # Run the crawl inside an async context manager — the browser is launched
     # on entry and shut down cleanly on exit
-    async with AsyncWebCrawler() as crawler:
+    async with shared_crawler() as crawler:
         result = await crawler.arun(url=URL, config=config)
 
     # Guard against crawl or extraction failures before accessing the payload
@@ -119,7 +119,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
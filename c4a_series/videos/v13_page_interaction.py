@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,7 +9,9 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from c4a_series.common.pool import run, shared_crawler
 
 # Define the target URL — a simple, stable page ideal for demonstrating
 # JavaScript injection without external dependencies
@@ -59,9 +60,9 @@ async def main() -> None:
         verbose=False,
     )
 
-    # Launch an async crawler session using a context manager, which handles
-    # browser startup and teardown (Crawl4AI uses a headless browser under the hood)
-    async with AsyncWebCrawler() as crawler:
+    # Borrow a warm crawler from the shared pool — the browser (Crawl4AI uses a
+    # headless browser under the hood) is launched once and reused across episodes
+    async with shared_crawler() as crawler:
         # Perform the crawl — arun() loads the page, executes js_code, waits
         # for ".js-ready" to appear, then captures the final page state
         result = await crawler.arun(url=URL, config=config)
@@ -77,7 +78,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,7 +9,9 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from c4a_series.common.pool import run, shared_crawler
 
 ############################ Session Configuration ###########################
 
@@ -53,7 +54,7 @@ async def main() -> None:
     that state back, proving it was preserved.  The session is then explicitly
     closed to free the underlying browser resource.
     """
-    async with AsyncWebCrawler() as crawler:
+    async with shared_crawler() as crawler:
         # --- Step 1: write state ---
         # Passing session_id tells Crawl4AI to open (or reuse) a named browser
         # tab for this request. SET_STATE_JS runs after the page loads and writes
@@ -105,7 +106,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
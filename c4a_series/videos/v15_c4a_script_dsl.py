@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,7 +9,9 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from c4a_series.common.pool import run, shared_crawler
 
 # Define the target URL to crawl
 URL = "https://example.com/"
@@ -76,9 +77,9 @@ async def main() -> None:
         verbose=False,
     )
 
-    # Launch an async crawler session using a context manager, which handles
-    # browser startup and teardown
-    async with AsyncWebCrawler() as crawler:
+    # Borrow a warm crawler from the shared pool, which launches the browser
+    # once and shuts it down when the run ends
+    async with shared_crawler() as crawler:
         # Perform the crawl — the DSL script runs automatically as part of the
         # page interaction phase, before the final HTML snapshot is taken
         result = await crawler.arun(url=URL, config=config)
@@ -93,7 +94,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,3 @@
-import asyncio
 import re
 import sys
 from pathlib import Path
@@ -11,7 +10,9 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig, VirtualScrollConfig
+from crawl4ai import BrowserConfig, CacheMode, CrawlerRunConfig, VirtualScrollConfig
+
+from c4a_series.common.pool import run, shared_crawler
 
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
@@ -76,7 +77,7 @@ async def main() -> None:
     # Launch a single headless browser session and run both crawls back-to-back.
     # Reusing the same AsyncWebCrawler instance avoids the overhead of spinning
     # up a second browser process.
-    async with AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False)) as crawler:
+    async with shared_crawler(BrowserConfig(headless=True, verbose=False)) as crawler:
         # Baseline crawl — captures the page exactly as it loads with no scrolling
         base = await crawler.arun(url=URL, config=base_config)
         # Virtual-scroll crawl — scrolls the page before capturing HTML
@@ -91,7 +92,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -11,7 +10,6 @@ if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from crawl4ai import (
-    AsyncWebCrawler,
     BrowserConfig,
     CacheMode,
     CrawlerMonitor,
@@ -20,6 +18,8 @@ from crawl4ai import (
     RateLimiter,
 )
 
+from c4a_series.common.pool import run, shared_crawler
+
 ############################# Target URLs ####################################
 
 # A small list of Crawl4AI documentation pages used to demonstrate batch and
@@ -100,7 +100,7 @@ async def main() -> None:
 
     # Launch a single browser context that is reused across all concurrent
     # crawl sessions — this is more efficient than opening a new browser per URL
-    async with AsyncWebCrawler(config=browser_config) as crawler:
+    async with shared_crawler(browser_config) as crawler:
 
         # --- Batch mode ---
         # arun_many() fans out across all URLS concurrently, respecting the
@@ -123,7 +123,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
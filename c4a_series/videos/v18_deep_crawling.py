@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -11,7 +10,6 @@ if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from crawl4ai import (
-    AsyncWebCrawler,
     BestFirstCrawlingStrategy,
     CrawlerRunConfig,
     FilterChain,
@@ -19,6 +17,8 @@ from crawl4ai import (
     URLPatternFilter,
 )
 
+from c4a_series.common.pool import run, shared_crawler
+
 # Define the seed URL where the deep crawl begins
 START_URL = "https://docs.crawl4ai.com/"
 
@@ -70,7 +70,7 @@ async def main() -> None:
     # collecting all results and returning them together at the end.
     config = CrawlerRunConfig(deep_crawl_strategy=strategy, stream=True, verbose=False)
 
-    async with AsyncWebCrawler() as crawler:
+    async with shared_crawler() as crawler:
         # Because stream=True is set, arun() returns an async generator;
         # we iterate over it to process pages one by one as they arrive.
         stream = await crawler.arun(START_URL, config=config)
@@ -93,7 +93,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
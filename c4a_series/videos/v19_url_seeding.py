@@ -1,4 +1,3 @@
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,7 +9,9 @@ from pathlib import Path
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from crawl4ai import AsyncUrlSeeder, AsyncWebCrawler, CacheMode, CrawlerRunConfig, SeedingConfig
+from crawl4ai import AsyncUrlSeeder, CacheMode, CrawlerRunConfig, SeedingConfig
+
+from c4a_series.common.pool import run, shared_crawler
 
 # The domain to seed — AsyncUrlSeeder will discover URLs belonging to this domain
 # without fully crawling every page (lightweight alternative to a full-site crawl)
@@ -64,7 +65,7 @@ async def main() -> None:
     # Open a single crawler session and crawl all valid URLs concurrently.
     # arun_many() is more efficient than calling arun() in a loop because it
     # manages a shared browser pool across all requests.
-    async with AsyncWebCrawler() as crawler:
+    async with shared_crawler() as crawler:
         results = await crawler.arun_many(
             valid_urls,
             config=CrawlerRunConfig(
@@ -81,7 +82,7 @@ async def main() -> None:
 
 ################################# Entry Point ################################
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
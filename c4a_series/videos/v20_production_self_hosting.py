@@ -1,4 +1,3 @@
-import asyncio
 import os
 import sys
 from pathlib import Path
@@ -12,7 +11,6 @@ if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from crawl4ai import (
-    AsyncWebCrawler,
     BrowserConfig,
     CacheMode,
     Crawl4aiDockerClient,
@@ -22,6 +20,7 @@ from crawl4ai import (
 )
 
 from c4a_series.common.io import load_env
+from c4a_series.common.pool import run, shared_crawler
 
 # Define the target URL to crawl — the official Crawl4AI documentation site
 URL = "https://docs.crawl4ai.com/"
@@ -77,7 +76,7 @@ async def local_sdk_demo() -> None:
     # enable_stealth=True activates a collection of bot-detection evasion
     # techniques (e.g., masking navigator.webdriver, spoofing browser
     # fingerprints) to make the headless browser appear more like a real user
-    async with AsyncWebCrawler(config=BrowserConfig(headless=True, enable_stealth=True, verbose=False)) as crawler:
+    async with shared_crawler(BrowserConfig(headless=True, enable_stealth=True, verbose=False)) as crawler:
         result = await crawler.arun(url=URL, config=run_config)
 
     # Safely extract the optional production-feature fields from the result
@@ -160,7 +159,7 @@ async def main() -> None:
     await self_host_demo()
 
 
-# Standard Python entry-point guard — use asyncio.run() to execute the
-# async main() coroutine from a synchronous context
+# Standard Python entry-point guard — run() wraps asyncio.run() and closes the
+# shared crawler pool before the event loop shuts down
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
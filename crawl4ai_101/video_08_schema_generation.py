@@ -3,6 +3,7 @@
 Demonstrates:
 - JsonCssExtractionStrategy.generate_schema()
 - saving a generated schema for reuse
+- re-validating a saved schema by field fill rate before trusting it
 - running the generated schema without another LLM call
 
 Prerequisites:
@@ -28,6 +29,7 @@ from crawl4ai import (
 
 API_KEY = os.getenv("OPENAI_API_KEY")
 OUTPUT_DIR = Path(__file__).resolve().parent / "output" / "video_08"
+MIN_FILL_RATE = 0.6
 SAMPLE_HTML = """
 <section class="products">
   <article class="product-card">
@@ -49,6 +51,26 @@ def ensure_output_dir() -> Path:
     return OUTPUT_DIR
 
 
+def fill_rate(schema: dict, html: str) -> float:
+    """Share of schema fields that come back non-empty when run locally on html."""
+    fields = [field["name"] for field in schema.get("fields", [])]
+    items = JsonCssExtractionStrategy(schema).run("", [html])
+    if not fields or not items:
+        return 0.0
+    filled = sum(1 for item in items for name in fields if item.get(name) not in (None, "", [], {}))
+    return filled / (len(items) * len(fields))
+
+
+def load_valid_schema(schema_path: Path, html: str) -> dict | None:
+    """Reuse a saved schema only while it still fills enough fields on fresh HTML."""
+    if not schema_path.exists():
+        return None
+    schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    rate = fill_rate(schema, html)
+    print(f"Saved schema fill rate: {rate:.0%}")
+    return schema if rate >= MIN_FILL_RATE else None
+
+
 async def main() -> None:
     if not API_KEY:
         print("SKIP: set OPENAI_API_KEY to generate a schema with an LLM.")
@@ -58,13 +80,16 @@ async def main() -> None:
         return
 
     output_dir = ensure_output_dir()
-    schema = JsonCssExtractionStrategy.generate_schema(
-        SAMPLE_HTML,
-        query="Extract each product name, price, and rating as a flat record.",
-        llm_config=LLMConfig(provider="openai/gpt-4o-mini", api_token=API_KEY),
-    )
     schema_path = output_dir / "product_schema.json"
-    schema_path.write_text(json.dumps(schema, indent=2), encoding="utf-8")
+    # Only pay for an LLM call when there is no saved schema or it has gone stale
+    schema = load_valid_schema(schema_path, SAMPLE_HTML)
+    if schema is None:
+        schema = JsonCssExtractionStrategy.generate_schema(
+            SAMPLE_HTML,
+            query="Extract each product name, price, and rating as a flat record.",
+            llm_config=LLMConfig(provider="openai/gpt-4o-mini", api_token=API_KEY),
+        )
+        schema_path.write_text(json.dumps(schema, indent=2), encoding="utf-8")
 
     config = CrawlerRunConfig(
         extraction_strategy=JsonCssExtractionStrategy(schema),
@@ -40,6 +40,20 @@ CONTACT_HTML = """
 """
 
 
+# Built once per process: the patterns are compiled here, not on every crawl
+CONTACT_STRATEGY = RegexExtractionStrategy(
+    pattern=(
+        RegexExtractionStrategy.Email
+        | RegexExtractionStrategy.Url
+        | RegexExtractionStrategy.Currency
+    ),
+    custom={
+        "sku": r"\b[A-Z]{2}-\d{3}\b",
+        "usd_price": r"\$\d+(?:\.\d{2})?",
+    },
+)
+
+
 async def run_xpath_demo() -> None:
     schema = {
         "name": "Release Table",
@@ -61,18 +75,7 @@ async def run_xpath_demo() -> None:
 
 
 async def run_regex_demo() -> None:
-    strategy = RegexExtractionStrategy(
-        pattern=(
-            RegexExtractionStrategy.Email
-            | RegexExtractionStrategy.Url
-            | RegexExtractionStrategy.Currency
-        ),
-        custom={
-            "sku": r"\b[A-Z]{2}-\d{3}\b",
-            "usd_price": r"\$\d+(?:\.\d{2})?",
-        },
-    )
-    config = CrawlerRunConfig(extraction_strategy=strategy, verbose=False)
+    config = CrawlerRunConfig(extraction_strategy=CONTACT_STRATEGY, verbose=False)
     async with AsyncWebCrawler() as crawler:
         result = await crawler.arun(f"raw://{CONTACT_HTML}", config=config)
     matches = json.loads(result.extracted_content or "[]")
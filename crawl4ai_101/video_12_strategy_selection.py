@@ -14,7 +14,6 @@ Run:
 """
 
 import asyncio
-import json
 
 from crawl4ai import (
     AsyncWebCrawler,
@@ -55,28 +54,25 @@ async def run_css_then_regex() -> None:
             {"name": "description", "selector": "p.description", "type": "text"},
         ],
     }
-    css_config = CrawlerRunConfig(
-        cache_mode=CacheMode.BYPASS,
-        extraction_strategy=JsonCssExtractionStrategy(css_schema),
-        verbose=False,
-    )
-    regex_config = CrawlerRunConfig(
-        cache_mode=CacheMode.BYPASS,
-        extraction_strategy=RegexExtractionStrategy(
-            custom={
-                "weight_grams": r"\b\d{3}g\b",
-                "dimensions_cm": r"\b\d{1,2} x \d{1,2} x \d{1,2} cm\b",
-            }
-        ),
-        verbose=False,
+    css_strategy = JsonCssExtractionStrategy(css_schema)
+    regex_strategy = RegexExtractionStrategy(
+        custom={
+            "weight_grams": r"\b\d{3}g\b",
+            "dimensions_cm": r"\b\d{1,2} x \d{1,2} x \d{1,2} cm\b",
+        }
     )
 
+    # Load the page once, then run both strategies on that same HTML in parallel
+    # instead of rendering it again for every strategy.
     async with AsyncWebCrawler() as crawler:
-        css_result = await crawler.arun(f"raw://{RAW_PRODUCTS}", config=css_config)
-        regex_result = await crawler.arun(f"raw://{RAW_PRODUCTS}", config=regex_config)
-
-    products = json.loads(css_result.extracted_content or "[]")
-    matches = json.loads(regex_result.extracted_content or "[]")
+        page = await crawler.arun(
+            f"raw://{RAW_PRODUCTS}",
+            config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS, verbose=False),
+        )
+    products, matches = await asyncio.gather(
+        asyncio.to_thread(css_strategy.run, page.url, [page.html]),
+        asyncio.to_thread(regex_strategy.run, page.url, [page.html]),
+    )
     print(f"Decision tree: structured HTML -> CSS, fine-grained patterns -> Regex")
     print(f"CSS products: {products}")
     print(f"Regex matches: {matches}")
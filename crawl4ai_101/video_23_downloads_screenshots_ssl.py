@@ -4,6 +4,8 @@ Demonstrates:
 - file download handling with accept_downloads
 - screenshot, PDF, and MHTML capture
 - SSL certificate export from CrawlResult
+- streaming artifact writers and a capture benchmark against a local page
+- archiving many URLs with arun_many, background writes and screenshot dedupe
 
 Prerequisites:
 - `pip install crawl4ai playwright`
@@ -11,24 +13,76 @@ Prerequisites:
 
 Run:
 - `python crawl4ai_101/video_23_downloads_screenshots_ssl.py`
+- `python crawl4ai_101/video_23_downloads_screenshots_ssl.py --bench --runs 5`
+- `python crawl4ai_101/video_23_downloads_screenshots_ssl.py --urls urls.txt --concurrency 8`
 """
 
+import argparse
 import asyncio
 import base64
+import hashlib
+import json
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
 
 OUTPUT_DIR = Path(__file__).resolve().parent / "output" / "video_23"
 DOWNLOAD_PAGE_URL = "https://www.python.org/downloads/windows/"
 CAPTURE_URL = "https://example.com/"
 
+# Artifacts are written in 1 MiB pieces; a multiple of 4 so each base64 slice
+# decodes on its own
+CHUNK_SIZE = 1 << 20
+
 
 def ensure_output_dir() -> Path:
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     return OUTPUT_DIR
 
 
+def write_base64(path: Path, data: str) -> int:
+    """Decode a base64 screenshot to disk one chunk at a time; returns bytes written."""
+    written = 0
+    with path.open("wb") as handle:
+        for start in range(0, len(data), CHUNK_SIZE):
+            written += handle.write(base64.b64decode(data[start : start + CHUNK_SIZE]))
+    return written
+
+
+def write_buffer(path: Path, data: bytes) -> int:
+    """Write PDF bytes through a memoryview so no slice of the buffer is ever copied."""
+    view = memoryview(data)
+    with path.open("wb") as handle:
+        for start in range(0, len(view), CHUNK_SIZE):
+            handle.write(view[start : start + CHUNK_SIZE])
+    return len(view)
+
+
+def write_text_chunks(path: Path, text: str) -> int:
+    """Encode MHTML in chunks instead of building one full-size bytes copy."""
+    written = 0
+    with path.open("wb") as handle:
+        for start in range(0, len(text), CHUNK_SIZE):
+            written += handle.write(text[start : start + CHUNK_SIZE].encode("utf-8"))
+    return written
+
+
+def save_artifacts(result, output_dir: Path, stem: str = "capture") -> int:
+    """Stream every captured artifact of a result to disk; returns total bytes written."""
+    written = 0
+    if result.screenshot:
+        written += write_base64(output_dir / f"{stem}.png", result.screenshot)
+    if result.pdf:
+        written += write_buffer(output_dir / f"{stem}.pdf", result.pdf)
+    if result.mhtml:
+        written += write_text_chunks(output_dir / f"{stem}.mhtml", result.mhtml)
+    return written
+
+
 async def download_demo(output_dir: Path) -> None:
     downloads_dir = output_dir / "downloads"
     downloads_dir.mkdir(parents=True, exist_ok=True)
@@ -69,12 +123,7 @@ async def capture_demo(output_dir: Path) -> None:
         print(f"Capture crawl failed: {result.error_message}")
         return
 
-    if result.screenshot:
-        (output_dir / "capture.png").write_bytes(base64.b64decode(result.screenshot))
-    if result.pdf:
-        (output_dir / "capture.pdf").write_bytes(result.pdf)
-    if result.mhtml:
-        (output_dir / "capture.mhtml").write_text(result.mhtml, encoding="utf-8")
+    save_artifacts(result, output_dir)
     if result.ssl_certificate:
         result.ssl_certificate.to_json(output_dir / "certificate.json")
         print(
@@ -90,6 +139,171 @@ async def capture_demo(output_dir: Path) -> None:
     )
 
 
+def url_slug(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def screenshot_digest(result) -> str | None:
+    # Hashing the base64 text is equivalent to hashing the PNG and skips a decode
+    return hashlib.sha256(result.screenshot.encode("ascii")).hexdigest() if result.screenshot else None
+
+
+def write_capture(result, archive_dir: Path, digest: str | None, store_screenshot: bool) -> dict:
+    """Write one page's artifacts; identical screenshots are stored once under their hash."""
+    page_dir = archive_dir / "pages" / url_slug(result.url)
+    page_dir.mkdir(parents=True, exist_ok=True)
+    record = {"url": result.url, "screenshot": digest, "bytes": 0, "artifacts": 0}
+    if store_screenshot:
+        record["bytes"] += write_base64(archive_dir / "screenshots" / f"{digest}.png", result.screenshot)
+        record["artifacts"] += 1
+    if result.pdf:
+        record["bytes"] += write_buffer(page_dir / "capture.pdf", result.pdf)
+        record["artifacts"] += 1
+    if result.mhtml:
+        record["bytes"] += write_text_chunks(page_dir / "capture.mhtml", result.mhtml)
+        record["artifacts"] += 1
+    return record
+
+
+async def capture_many(urls: list[str], output_dir: Path, concurrency: int = 8) -> dict:
+    """Archive png+pdf+mhtml for every URL while later pages are still rendering."""
+    archive_dir = output_dir / "archive"
+    (archive_dir / "screenshots").mkdir(parents=True, exist_ok=True)
+    seen_screenshots = {path.stem for path in (archive_dir / "screenshots").glob("*.png")}
+    run_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS, screenshot=True, pdf=True, capture_mhtml=True, stream=True, verbose=False
+    )
+    dispatcher = MemoryAdaptiveDispatcher(memory_threshold_percent=80.0, max_session_permit=concurrency)
+    # Bound queued writes so finished results cannot pile up in memory faster than disk drains them
+    write_slots = asyncio.Semaphore(concurrency * 2)
+    stats = {"pages": 0, "failed": 0, "failed_writes": 0, "artifacts": 0, "bytes": 0, "duplicate_screenshots": 0}
+
+    async def write(result, manifest, digest: str | None, store_screenshot: bool) -> None:
+        try:
+            record = await asyncio.to_thread(write_capture, result, archive_dir, digest, store_screenshot)
+        except (OSError, ValueError) as exc:  # disk errors, malformed base64
+            # Finished tasks are discarded unawaited, so report failures here or they vanish
+            stats["failed_writes"] += 1
+            if store_screenshot:
+                seen_screenshots.discard(digest)  # let a later page store this screenshot
+            print(f"Artifact write failed: {result.url} {exc}")
+            return
+        finally:
+            write_slots.release()
+        stats["artifacts"] += record["artifacts"]
+        stats["bytes"] += record["bytes"]
+        manifest.write(json.dumps(record) + "\n")
+
+    started = time.perf_counter()
+    writes: set[asyncio.Task] = set()
+    with (archive_dir / "manifest.jsonl").open("a", encoding="utf-8") as manifest:
+        async with AsyncWebCrawler() as crawler:
+            async for result in await crawler.arun_many(urls=urls, config=run_config, dispatcher=dispatcher):
+                stats["pages"] += 1
+                if not result.success:
+                    stats["failed"] += 1
+                    print(f"Capture failed: {result.url} {result.error_message}")
+                    continue
+                # Dedupe on the event loop so two writer threads never race on one digest
+                digest = screenshot_digest(result)
+                store_screenshot = digest is not None and digest not in seen_screenshots
+                if digest is not None:
+                    stats["duplicate_screenshots"] += not store_screenshot
+                    seen_screenshots.add(digest)
+                await write_slots.acquire()
+                task = asyncio.create_task(write(result, manifest, digest, store_screenshot))
+                writes.add(task)
+                task.add_done_callback(writes.discard)
+        await asyncio.gather(*writes)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def fixture_page(sections: int = 400) -> bytes:
+    """A long page, so full-page screenshots and PDFs reach realistic sizes."""
+    body = "".join(
+        f"<section><h2>Section {i}</h2><p>{'Lorem ipsum dolor sit amet. ' * 40}</p></section>"
+        for i in range(sections)
+    )
+    return f"<html><head><title>Capture fixture</title></head><body>{body}</body></html>".encode()
+
+
+def start_fixture_server() -> ThreadingHTTPServer:
+    page = fixture_page()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def naive_save(result, output_dir: Path) -> int:
+    # The previous writers: each artifact is fully materialised before writing
+    png = base64.b64decode(result.screenshot)
+    (output_dir / "naive.png").write_bytes(png)
+    (output_dir / "naive.pdf").write_bytes(result.pdf)
+    (output_dir / "naive.mhtml").write_text(result.mhtml, encoding="utf-8")
+    return len(png) + len(result.pdf) + len(result.mhtml.encode("utf-8"))
+
+
+def measure(writer, result, output_dir: Path) -> tuple[int, float, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = writer(result, output_dir)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return written, elapsed, peak
+
+
+async def bench(output_dir: Path, runs: int) -> None:
+    bench_dir = output_dir / "bench"
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    server = start_fixture_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    run_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS, screenshot=True, pdf=True, capture_mhtml=True, verbose=False
+    )
+    totals = {"capture": 0.0, "streaming": 0.0, "naive": 0.0, "bytes": 0}
+    peaks = {"streaming": 0, "naive": 0}
+    try:
+        async with AsyncWebCrawler() as crawler:
+            for _ in range(runs):
+                started = time.perf_counter()
+                result = await crawler.arun(url, config=run_config)
+                totals["capture"] += time.perf_counter() - started
+                if not (result.success and result.screenshot and result.pdf and result.mhtml):
+                    print(f"Benchmark capture incomplete: {result.error_message}")
+                    return
+                written, elapsed, peak = measure(save_artifacts, result, bench_dir)
+                totals["streaming"] += elapsed
+                totals["bytes"] += written
+                peaks["streaming"] = max(peaks["streaming"], peak)
+                _, elapsed, peak = measure(naive_save, result, bench_dir)
+                totals["naive"] += elapsed
+                peaks["naive"] = max(peaks["naive"], peak)
+    finally:
+        server.shutdown()
+
+    mb = totals["bytes"] / 1e6
+    print(f"Captures: {runs} in {totals['capture']:.2f}s ({runs / totals['capture']:.2f}/s), {mb / runs:.1f} MB each")
+    for name in ("streaming", "naive"):
+        print(
+            f"{name:>9} writers: {mb / totals[name]:.0f} MB/s, "
+            f"peak extra memory {peaks[name] / 1e6:.1f} MB"
+        )
+
+
 async def main() -> None:
     output_dir = ensure_output_dir()
     await download_demo(output_dir)
@@ -97,4 +311,22 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bench", action="store_true", help="Benchmark capture and artifact writes on a local page.")
+    parser.add_argument("--runs", type=int, default=5, help="Captures to run with --bench (default: 5).")
+    parser.add_argument("--urls", type=Path, help="File with one URL per line to archive as png+pdf+mhtml.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Pages rendered at once with --urls (default: 8).")
+    args = parser.parse_args()
+    if args.bench:
+        asyncio.run(bench(ensure_output_dir(), args.runs))
+    elif args.urls:
+        urls = [line.strip() for line in args.urls.read_text(encoding="utf-8").splitlines() if line.strip()]
+        stats = asyncio.run(capture_many(urls, ensure_output_dir(), args.concurrency))
+        seconds = stats["seconds"] or 1e-9
+        print(
+            f"{stats['pages']} pages ({stats['failed']} failed, {stats['failed_writes']} write errors) in {seconds:.1f}s: "
+            f"{stats['artifacts'] / seconds:.1f} artifacts/s, {stats['bytes'] / seconds / 1e6:.1f} MB/s, "
+            f"{stats['duplicate_screenshots']} duplicate screenshots skipped"
+        )
+    else:
+        asyncio.run(main())
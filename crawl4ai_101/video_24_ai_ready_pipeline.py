@@ -2,21 +2,33 @@
 
 Demonstrates:
 - discover -> crawl -> filter -> export workflow
-- deep crawl for discovery plus arun_many() for processing
-- route-specific configs, rate limiting, and JSON/markdown export
+- streaming deep crawl for discovery, reprocessing the fetched HTML via raw://
+- one crawler shared by both stages
+- route-specific configs selected per URL
+- pluggable exporters written as each page finishes: markdown files with a
+  JSONL manifest, size-rotated JSONL shards, or Parquet/Arrow files
+- SimHash + LSH near-duplicate detection that drops or links duplicate pages
+- heading-aware, token-bounded chunks with stable ids, emitted only when new
 
 Prerequisites:
 - `pip install crawl4ai playwright`
 - `playwright install`
+- `pip install pyarrow` for the parquet and arrow exporters
+- optional `pip install tiktoken` for exact token counts in the chunks exporter
 
 Run:
 - `python crawl4ai_101/video_24_ai_ready_pipeline.py`
+- `python crawl4ai_101/video_24_ai_ready_pipeline.py --exporter parquet --exporter jsonl`
+- `python crawl4ai_101/video_24_ai_ready_pipeline.py --dedup link --exporter chunks`
 """
 
+import argparse
 import asyncio
+import hashlib
 import json
 import re
 import time
+from array import array
 from pathlib import Path
 
 from crawl4ai import (
@@ -30,27 +42,35 @@ from crawl4ai import (
     LXMLWebScrapingStrategy,
     MatchMode,
     PruningContentFilter,
-    RateLimiter,
 )
-from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy, FilterChain, URLPatternFilter
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for the parquet and arrow exporters
+    pa = pq = None
+
+try:
+    import tiktoken
+except ImportError:  # Chunk sizes fall back to whitespace-delimited words
+    tiktoken = None
+
 ROOT_URL = "https://docs.crawl4ai.com/"
 OUTPUT_DIR = Path(__file__).resolve().parent / "output" / "video_24"
 
 
-def ensure_output_dir() -> tuple[Path, Path]:
-    base = OUTPUT_DIR
-    markdown_dir = base / "markdown"
-    markdown_dir.mkdir(parents=True, exist_ok=True)
-    return base, markdown_dir
+def ensure_output_dir() -> Path:
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    return OUTPUT_DIR
 
 
 def slugify(url: str) -> str:
     return re.sub(r"[^a-z0-9]+", "-", url.lower()).strip("-")[:80] or "page"
 
 
-async def discover_urls() -> list[str]:
+async def discover_pages(crawler: AsyncWebCrawler):
+    """Yield each successfully fetched page as soon as the BFS crawl reaches it."""
     config = CrawlerRunConfig(
         check_robots_txt=True,
         deep_crawl_strategy=BFSDeepCrawlStrategy(
@@ -60,27 +80,28 @@ async def discover_urls() -> list[str]:
             filter_chain=FilterChain([URLPatternFilter(["*core/*", "*api/*", "*quickstart*"])]),
         ),
         scraping_strategy=LXMLWebScrapingStrategy(),
-        stream=False,
+        stream=True,
         verbose=False,
     )
-    async with AsyncWebCrawler(config=BrowserConfig(text_mode=True, light_mode=True, verbose=False)) as crawler:
-        results = await crawler.arun(ROOT_URL, config=config)
-    urls = [result.url for result in results if getattr(result, "success", False)]
-    return list(dict.fromkeys(urls))
+    seen = set()
+    async for result in await crawler.arun(ROOT_URL, config=config):
+        # Keep the first successful fetch of each URL; its HTML feeds the processing stage
+        if getattr(result, "success", False) and result.html and result.url not in seen:
+            seen.add(result.url)
+            yield result
 
 
-async def process_urls(urls: list[str]) -> list:
+def build_route_configs() -> list[CrawlerRunConfig]:
     api_schema = {
         "name": "DocHeadings",
         "baseSelector": "main h1, main h2",
         "fields": [{"name": "heading", "type": "text"}],
     }
-    configs = [
+    return [
         CrawlerRunConfig(
             url_matcher=["*api/*"],
             match_mode=MatchMode.OR,
             extraction_strategy=JsonCssExtractionStrategy(api_schema),
-            check_robots_txt=True,
             cache_mode=CacheMode.BYPASS,
             verbose=False,
         ),
@@ -93,7 +114,6 @@ async def process_urls(urls: list[str]) -> list:
                     bm25_threshold=1.0,
                 )
             ),
-            check_robots_txt=True,
             cache_mode=CacheMode.BYPASS,
             verbose=False,
         ),
@@ -101,57 +121,434 @@ async def process_urls(urls: list[str]) -> list:
             markdown_generator=DefaultMarkdownGenerator(
                 content_filter=PruningContentFilter(threshold=0.48)
             ),
-            check_robots_txt=True,
             cache_mode=CacheMode.BYPASS,
             verbose=False,
         ),
     ]
-    dispatcher = MemoryAdaptiveDispatcher(
-        memory_threshold_percent=80.0,
-        max_session_permit=4,
-        rate_limiter=RateLimiter(base_delay=(0.5, 1.0), max_retries=2),
+
+
+def select_config(url: str, configs: list[CrawlerRunConfig]) -> CrawlerRunConfig:
+    # Same first-match rule arun_many applies to a config list; the last config has no matcher
+    return next(config for config in configs if config.is_match(url))
+
+
+async def process_page(crawler: AsyncWebCrawler, page, configs: list[CrawlerRunConfig]):
+    """Re-run markdown and extraction on HTML fetched during discovery, without refetching."""
+    # base_url keeps relative links resolving against the page's real address
+    config = select_config(page.url, configs).clone(base_url=page.url)
+    result = (await crawler.arun(f"raw://{page.html}", config=config))[0]
+    result.url = page.url
+    result.status_code = page.status_code
+    return result
+
+
+def page_record(result) -> dict:
+    markdown = getattr(result.markdown, "fit_markdown", None) or getattr(
+        result.markdown, "raw_markdown", str(result.markdown)
     )
-    async with AsyncWebCrawler(config=BrowserConfig(text_mode=True, light_mode=True, verbose=False)) as crawler:
-        return await crawler.arun_many(urls, config=configs, dispatcher=dispatcher)
+    return {
+        "url": result.url,
+        "success": bool(result.success),
+        "status_code": result.status_code,
+        "markdown": markdown or "",
+        "extracted_content": result.extracted_content,
+        "cluster_id": None,
+        "duplicate_of": None,
+    }
 
 
-async def main() -> None:
-    output_dir, markdown_dir = ensure_output_dir()
-    started = time.perf_counter()
-    urls = await discover_urls()
-    if not urls:
-        print("No URLs discovered during the deep-crawl stage.")
-        return
+def simhash(text: str, shingle_size: int = 3) -> int | None:
+    """64-bit SimHash over word shingles; near-identical texts differ in only a few bits."""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    weights = [0] * 64
+    for start in range(max(1, len(words) - shingle_size + 1)):
+        shingle = " ".join(words[start : start + shingle_size]).encode("utf-8")
+        value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class NearDuplicateIndex:
+    """LSH over SimHash bands that keeps only one signature per cluster.
+
+    A signature is split into max_distance + 1 bands, so any two signatures
+    within max_distance bits agree exactly on at least one band and meet in
+    the same bucket. Only cluster representatives are indexed, in flat arrays:
+    an 8-byte signature, an 8-byte offset into the on-disk URL file and a
+    4-byte bucket-chain link per band, i.e. 32 bytes per distinct page at the
+    default distance, plus fixed 1 MiB of bucket heads. Past max_representatives
+    new pages still get a cluster id but are no longer indexed, so memory
+    stays capped however large the crawl grows.
+    """
+
+    SLOTS = 1 << 16  # Bucket heads per band; chains are verified by full distance
+
+    def __init__(self, urls_path: Path, max_distance: int = 3, max_representatives: int = 20_000_000):
+        self.max_distance = max_distance
+        self.max_representatives = max_representatives
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self.signatures = array("Q")
+        self.url_offsets = array("Q")
+        self.heads = [array("i", [-1]) * self.SLOTS for _ in range(self.bands)]
+        self.links = [array("i") for _ in range(self.bands)]
+        self.clusters = 0
+        self._urls = urls_path.open("w+b")
+
+    def _slots(self, signature: int) -> list[int]:
+        mask = (1 << self.band_bits) - 1
+        return [(signature >> band * self.band_bits & mask) % self.SLOTS for band in range(self.bands)]
+
+    def _url(self, cluster_id: int) -> str:
+        self._urls.seek(self.url_offsets[cluster_id])
+        line = self._urls.readline()
+        self._urls.seek(0, 2)
+        return line.rstrip(b"\n").decode("utf-8")
 
-    results = await process_urls(urls)
-    manifest = []
-    success_count = 0
-    for result in results:
-        markdown = getattr(result.markdown, "fit_markdown", None) or getattr(
-            result.markdown, "raw_markdown", str(result.markdown)
+    def add(self, url: str, text: str) -> tuple[int | None, str | None]:
+        """Return ``(cluster_id, representative_url)``; the url is None for a new cluster."""
+        signature = simhash(text)
+        if signature is None:
+            return None, None
+        slots = self._slots(signature)
+        for band, slot in enumerate(slots):
+            cluster_id = self.heads[band][slot]
+            while cluster_id != -1:
+                if (self.signatures[cluster_id] ^ signature).bit_count() <= self.max_distance:
+                    return cluster_id, self._url(cluster_id)
+                cluster_id = self.links[band][cluster_id]
+        cluster_id = self.clusters
+        self.clusters += 1
+        if len(self.signatures) < self.max_representatives:
+            # Indexed ids are dense, so array positions and cluster ids coincide
+            self.signatures.append(signature)
+            self.url_offsets.append(self._urls.tell())
+            self._urls.write(url.encode("utf-8") + b"\n")
+            for band, slot in enumerate(slots):
+                self.links[band].append(self.heads[band][slot])
+                self.heads[band][slot] = cluster_id
+        return cluster_id, None
+
+    def close(self) -> None:
+        self._urls.close()
+
+
+class MarkdownExporter:
+    """One .md file per page plus a JSONL manifest line."""
+
+    def __init__(self, output_dir: Path):
+        self.markdown_dir = output_dir / "markdown"
+        self.markdown_dir.mkdir(parents=True, exist_ok=True)
+        self.path = output_dir / "manifest.jsonl"
+        self._manifest = self.path.open("w", encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        # Linked duplicates point at their representative's file instead of writing their own
+        markdown_path = self.markdown_dir / f"{slugify(record['duplicate_of'] or record['url'])}.md"
+        if record["duplicate_of"] is None:
+            markdown_path.write_text(record["markdown"], encoding="utf-8")
+        line = {
+            "url": record["url"],
+            "success": record["success"],
+            "status_code": record["status_code"],
+            "markdown_file": markdown_path.name,
+            "cluster_id": record["cluster_id"],
+            "duplicate_of": record["duplicate_of"],
+            "extracted_content_preview": (record["extracted_content"] or "")[:240],
+        }
+        # Flush per line so downstream jobs can tail the manifest while the crawl runs
+        self._manifest.write(json.dumps(line) + "\n")
+        self._manifest.flush()
+
+    def close(self) -> None:
+        self._manifest.close()
+
+
+class JsonlShardExporter:
+    """Full records as JSON lines, rotated into a new shard once one reaches max_bytes."""
+
+    def __init__(self, output_dir: Path, max_bytes: int = 128 * 1024 * 1024):
+        self.path = output_dir / "shards"
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Each run rewrites the shard set, so drop shards a longer earlier run left behind
+        for stale in self.path.glob("pages-*.jsonl"):
+            stale.unlink()
+        self.max_bytes = max_bytes
+        self._sequence = -1
+        self._file = None
+        self._size = 0
+
+    def write(self, record: dict) -> None:
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._file is None or (self._size and self._size + len(data) > self.max_bytes):
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def _rotate(self) -> None:
+        self.close()
+        self._sequence += 1
+        self._file = (self.path / f"pages-{self._sequence:05d}.jsonl").open("wb")
+        self._size = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ParquetExporter:
+    """Columnar file with one row group per row_group_size pages, for predicate pushdown."""
+
+    suffix = "parquet"
+
+    def __init__(self, output_dir: Path, row_group_size: int = 1000):
+        if pa is None:
+            raise ValueError(f"The {self.suffix} exporter needs the pyarrow package: pip install pyarrow")
+        self.schema = pa.schema(
+            [
+                ("url", pa.string()),
+                ("success", pa.bool_()),
+                ("status_code", pa.int32()),
+                ("markdown", pa.large_string()),
+                ("extracted_content", pa.large_string()),
+                ("cluster_id", pa.int64()),
+                ("duplicate_of", pa.string()),
+            ]
         )
-        markdown_path = markdown_dir / f"{slugify(result.url)}.md"
-        markdown_path.write_text(markdown or "", encoding="utf-8")
-        success_count += int(bool(result.success))
-        manifest.append(
-            {
-                "url": result.url,
-                "success": result.success,
-                "status_code": result.status_code,
-                "markdown_file": markdown_path.name,
-                "extracted_content_preview": (result.extracted_content or "")[:240],
+        self.path = output_dir / f"pages.{self.suffix}"
+        self.row_group_size = row_group_size
+        self._rows: list[dict] = []
+        self._writer = self._open_writer()
+
+    def _open_writer(self):
+        return pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+    def write(self, record: dict) -> None:
+        # Only one row group of records is buffered before it reaches disk
+        self._rows.append(record)
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+class ArrowExporter(ParquetExporter):
+    """Arrow IPC file with one record batch per row_group_size pages; memory-maps for reading."""
+
+    suffix = "arrow"
+
+    def _open_writer(self):
+        return pa.ipc.new_file(str(self.path), self.schema)
+
+
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+
+
+def split_sections(markdown: str) -> list[tuple[list[str], str]]:
+    """Split markdown at headings into ``(heading_path, text)``; fenced code is never split."""
+    sections = []
+    path: list[str] = []
+    lines: list[str] = []
+    in_fence = False
+    for line in markdown.splitlines(keepends=True):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        if match:
+            if "".join(lines).strip():
+                sections.append((list(path), "".join(lines).strip()))
+            level = len(match.group(1))
+            path = path[: level - 1] + [match.group(2)]
+            lines = []
+        lines.append(line)
+    if "".join(lines).strip():
+        sections.append((list(path), "".join(lines).strip()))
+    return sections
+
+
+class TokenWindow:
+    """Token counting and windowing with tiktoken, or whitespace words without it."""
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding)
+            except Exception:  # The encoding file is downloaded on first use; offline runs count words
+                print(f"tiktoken encoding {encoding!r} unavailable; counting words instead.")
+
+    def split(self, text: str, max_tokens: int, overlap: int) -> list[tuple[str, int]]:
+        if self._encoding is not None:
+            units = self._encoding.encode(text)
+            join = self._encoding.decode
+        else:
+            # Words keep their trailing whitespace so joined windows preserve layout
+            units = re.findall(r"\S+\s*", text)
+            join = "".join
+        if len(units) <= max_tokens:
+            return [(text, len(units))]
+        step = max(1, max_tokens - overlap)
+        windows = []
+        for start in range(0, len(units), step):
+            window = units[start : start + max_tokens]
+            windows.append((join(window).strip(), len(window)))
+            if start + max_tokens >= len(units):
+                break
+        return windows
+
+
+def chunk_id(url: str, heading_path: list[str], text: str) -> str:
+    return hashlib.sha1("\x1f".join([url, " > ".join(heading_path), text]).encode("utf-8")).hexdigest()
+
+
+def chunk_markdown(url: str, markdown: str, window: TokenWindow, max_tokens: int = 512, overlap: int = 64):
+    for heading_path, section in split_sections(markdown):
+        for text, tokens in window.split(section, max_tokens, overlap):
+            yield {
+                "id": chunk_id(url, heading_path, text),
+                "url": url,
+                "heading_path": heading_path,
+                "tokens": tokens,
+                "text": text,
             }
-        )
 
-    manifest_path = output_dir / "manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+class ChunkExporter:
+    """Embedding-ready chunks as JSONL, skipping any chunk id an earlier run already emitted.
+
+    Ids hash the url, heading path and text, so an unchanged chunk keeps its
+    id across runs and only new or edited text reaches chunks.jsonl. Emitted
+    ids are appended to chunk_ids.txt as they are written.
+    """
+
+    def __init__(self, output_dir: Path, max_tokens: int = 512, overlap: int = 64):
+        self.path = output_dir / "chunks.jsonl"
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.window = TokenWindow()
+        ids_path = output_dir / "chunk_ids.txt"
+        self.seen = set(ids_path.read_text(encoding="utf-8").split()) if ids_path.exists() else set()
+        self._chunks = self.path.open("w", encoding="utf-8")
+        self._ids = ids_path.open("a", encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        if not record["success"] or not record["markdown"]:
+            return
+        for chunk in chunk_markdown(record["url"], record["markdown"], self.window, self.max_tokens, self.overlap):
+            if chunk["id"] in self.seen:
+                continue
+            self.seen.add(chunk["id"])
+            self._chunks.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            self._ids.write(chunk["id"] + "\n")
+        self._chunks.flush()
+        self._ids.flush()
+
+    def close(self) -> None:
+        self._chunks.close()
+        self._ids.close()
+
+
+EXPORTERS = {
+    "markdown": MarkdownExporter,
+    "jsonl": JsonlShardExporter,
+    "parquet": ParquetExporter,
+    "arrow": ArrowExporter,
+    "chunks": ChunkExporter,
+}
+
+
+async def main(exporter_names: list[str] = ("markdown",), dedup: str = "off", concurrency: int = 4) -> None:
+    output_dir = ensure_output_dir()
+    exporters = [EXPORTERS[name](output_dir) for name in dict.fromkeys(exporter_names)]
+    configs = build_route_configs()
+    duplicates = NearDuplicateIndex(output_dir / "representatives.txt") if dedup != "off" else None
+    started = time.perf_counter()
+    stats = {"discovered": 0, "processed": 0, "succeeded": 0, "duplicates": 0, "failed": 0}
+    # Discovery waits for a free slot before handing over the next page, so at
+    # most `concurrency` pages are held in memory however large the crawl gets
+    slots = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task] = set()
+
+    async def process_and_export(crawler, page) -> None:
+        try:
+            result = await process_page(crawler, page, configs)
+            record = page_record(result)
+            stats["processed"] += 1
+            stats["succeeded"] += int(bool(result.success))
+            if duplicates is not None and record["success"]:
+                record["cluster_id"], record["duplicate_of"] = duplicates.add(record["url"], record["markdown"])
+                if record["duplicate_of"] is not None:
+                    stats["duplicates"] += 1
+                    if dedup == "drop":
+                        return
+                    # Linked duplicates keep their row but not a second copy of the text
+                    record["markdown"] = ""
+            for exporter in exporters:
+                exporter.write(record)
+        except Exception as exc:
+            # Finished tasks are discarded unawaited, so report failures here or they vanish
+            stats["failed"] += 1
+            print(f"Pipeline error for {page.url}: {exc!r}")
+        finally:
+            slots.release()
+
+    # One browser serves both stages: discovery fetches each page once, and
+    # processing reuses that HTML through raw:// without touching the network
+    try:
+        async with AsyncWebCrawler(config=BrowserConfig(text_mode=True, light_mode=True, verbose=False)) as crawler:
+            async for page in discover_pages(crawler):
+                stats["discovered"] += 1
+                await slots.acquire()
+                task = asyncio.create_task(process_and_export(crawler, page))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+    finally:
+        for exporter in exporters:
+            exporter.close()
+        if duplicates is not None:
+            duplicates.close()
+
+    if not stats["discovered"]:
+        print("No URLs discovered during the deep-crawl stage.")
+        return
     elapsed = time.perf_counter() - started
-    print(f"Discovered URLs: {len(urls)}")
-    print(f"Processed results: {len(results)}")
-    print(f"Successful results: {success_count}")
-    print(f"Manifest saved to: {manifest_path}")
+    print(f"Discovered URLs: {stats['discovered']}")
+    print(f"Processed results: {stats['processed']}")
+    print(f"Successful results: {stats['succeeded']}")
+    print(f"Processing or export errors: {stats['failed']}")
+    if duplicates is not None:
+        print(f"Near-duplicates {'dropped' if dedup == 'drop' else 'linked'}: {stats['duplicates']}")
+    for exporter in exporters:
+        print(f"Exported to: {exporter.path}")
     print(f"Elapsed time: {elapsed:.2f}s")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--exporter",
+        action="append",
+        choices=sorted(EXPORTERS),
+        help="Output format; repeat to write several at once (default: markdown).",
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=["off", "drop", "link"],
+        default="off",
+        help="Drop near-duplicate pages, or link them to their cluster's first page (default: off).",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.exporter or ["markdown"], args.dedup))
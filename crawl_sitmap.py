@@ -1,77 +1,1244 @@
 #%% Imports
 import argparse
+import bisect
+import gzip
+import hashlib
+import io
+import json
+import math
+import multiprocessing
 import os
+import queue
+import tarfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
 from urllib.parse import urlparse, unquote
+from xml.etree import ElementTree
 from crawl4ai import Crawl4ai
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+try:
+    import zstandard
+except ImportError:  # Only needed for --format jsonl.zst
+    zstandard = None
+
+#%% Stage Statistics
+# Sentinel that tells queue consumers to shut down
+_STOP = object()
+
+
+class StageStats:
+    """Thread-safe page counter and busy-time accumulator for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pages = 0
+        self.busy_seconds = 0.0
+        # Per-page durations, kept for latency percentiles in the benchmark harness
+        self.samples: list[float] = []
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.pages += 1
+            self.busy_seconds += seconds
+            self.samples.append(seconds)
+
+    def rate(self, wall_seconds: float | None = None) -> float:
+        # Stages we drive ourselves report throughput over their own busy time;
+        # the fetch stage runs inside the crawler, so it is measured over wall time
+        seconds = wall_seconds if wall_seconds is not None else self.busy_seconds
+        return self.pages / seconds if seconds > 0 else 0.0
+
+
+def print_stage_report(stats: dict[str, StageStats], wall_seconds: float) -> None:
+    print(f"Stage throughput over {wall_seconds:.2f}s:")
+    for stage in stats.values():
+        wall = wall_seconds if stage.name == "fetch" else None
+        print(f"  {stage.name:<8} pages={stage.pages:<6} pages/sec={stage.rate(wall):.2f}")
+
+#%% Checkpoint Journal
+JOURNAL_NAME = ".sitemap_journal.jsonl"
+# Statuses that mean the output file is current and the URL needs no more work
+DONE_STATUSES = {"saved", "unchanged"}
+
+
+def shard_path(output_dir: str, name: str, shard: int | None = None) -> Path:
+    # Worker processes keep their own metadata files, e.g. ".sitemap_journal.shard-03.jsonl"
+    if shard is None:
+        return Path(output_dir) / name
+    base, ext = name.rsplit(".", 1)
+    return Path(output_dir) / f"{base}.shard-{shard:02d}.{ext}"
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of per-URL outcomes kept under the output directory.
+
+    With ``resume=True`` the existing journal is replayed into an in-memory set of
+    saved URLs, so finished pages are skipped with an O(1) membership check.
+    Worker processes (``shard`` set) read the shared journal but append to their own file.
+    """
+
+    def __init__(self, output_dir: str, resume: bool = False, shard: int | None = None):
+        self.path = shard_path(output_dir, JOURNAL_NAME, shard)
+        self.done: set[str] = set()
+        self.failed: set[str] = set()
+        canonical = Path(output_dir) / JOURNAL_NAME
+        if resume and canonical.exists():
+            self._load(canonical)
+        self._file = open(self.path, "a" if resume and shard is None else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _load(self, path: Path) -> None:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn final line; everything before it is valid
+                    continue
+                if entry.get("status") in DONE_STATUSES:
+                    self.done.add(entry["url"])
+                else:
+                    self.done.discard(entry["url"])
+
+    def record(self, url: str, status: str, content_hash: str | None = None, path: str | None = None) -> None:
+        line = json.dumps({"url": url, "status": status, "sha1": content_hash, "path": path}) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if status == "failed":
+                self.failed.add(url)
+
+    def close(self) -> None:
+        self._file.close()
+
+#%% Sitemap Parsing and Conditional Fetch
+USER_AGENT = "Mozilla/5.0 (compatible; crawl_sitmap/1.0)"
+FETCH_TIMEOUT = 30
+
+
+class SitemapEntry(NamedTuple):
+    url: str
+    lastmod: str | None
+
+
+class FetchResult(NamedTuple):
+    status: int
+    html: str
+    etag: str | None
+    error: str | None = None
+
+
+def _local_name(tag: str) -> str:
+    # "{http://www.sitemaps.org/schemas/sitemap/0.9}url" -> "url"; tolerates sitemaps without a namespace
+    return tag.rsplit("}", 1)[-1]
+
+
+def _open_sitemap(sitemap_url: str):
+    request = urllib.request.Request(sitemap_url, headers={"User-Agent": USER_AGENT})
+    response = urllib.request.urlopen(request, timeout=FETCH_TIMEOUT)
+    stream = io.BufferedReader(response)
+    # Servers often send .xml.gz as application/octet-stream, so sniff the gzip magic bytes
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def iter_sitemap_entries(sitemap_url: str, _seen: set[str] | None = None) -> Iterator[SitemapEntry]:
+    """Stream <url> entries from a sitemap or sitemap index as they are parsed.
+
+    Sitemap indexes are expanded recursively and gzip'd sitemaps are decompressed on
+    the fly. Parsed elements are cleared immediately, so memory stays flat no matter
+    how many entries the sitemap holds.
+    """
+    seen = _seen if _seen is not None else set()
+    if sitemap_url in seen:
+        return
+    seen.add(sitemap_url)
+
+    child_sitemaps = []
+    with _open_sitemap(sitemap_url) as stream:
+        root = None
+        for event, elem in ElementTree.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            name = _local_name(elem.tag)
+            if name not in ("url", "sitemap"):
+                continue
+            loc, lastmod = "", None
+            for child in elem:
+                child_name = _local_name(child.tag)
+                if child_name == "loc":
+                    loc = (child.text or "").strip()
+                elif child_name == "lastmod":
+                    lastmod = (child.text or "").strip() or None
+            # Drop parsed elements so the tree never grows with the sitemap
+            root.clear()
+            if not loc:
+                continue
+            if name == "url":
+                yield SitemapEntry(loc, lastmod)
+            else:
+                child_sitemaps.append(loc)
+
+    # Child sitemaps are expanded after the index stream is closed, one connection at a time
+    for child_url in child_sitemaps:
+        try:
+            yield from iter_sitemap_entries(child_url, seen)
+        except (urllib.error.URLError, OSError, ElementTree.ParseError) as e:
+            print(f"Failed to expand sitemap {child_url}: {e}")
+
+
+def run_bounded(worker: Callable, items: Iterable, concurrency: int, queue_size: int | None = None) -> None:
+    # Feed a (possibly endless) iterator to worker threads through a bounded queue,
+    # so producing items never runs more than queue_size ahead of the workers
+    work: queue.Queue = queue.Queue(maxsize=queue_size or concurrency * 4)
+
+    def consume():
+        while True:
+            item = work.get()
+            if item is _STOP:
+                return
+            try:
+                worker(item)
+            except Exception as e:
+                # A dead consumer would stall the feeder, so log and keep going
+                print(f"Worker error on {item}: {e}")
+
+    threads = [threading.Thread(target=consume, name=f"fetch-{i}", daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        for item in items:
+            work.put(item)
+    finally:
+        for _ in threads:
+            work.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+
+def fetch_page(url: str, etag: str | None = None) -> FetchResult:
+    # Send If-None-Match when we have an ETag so unchanged pages come back as 304
+    headers = {"User-Agent": USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            charset = response.headers.get_content_charset() or "utf-8"
+            html_content = response.read().decode(charset, errors="replace")
+            return FetchResult(response.status, html_content, response.headers.get("ETag"))
+    except urllib.error.HTTPError as e:
+        # urllib surfaces 304 Not Modified as an HTTPError
+        error = None if e.code == 304 else str(e)
+        return FetchResult(e.code, "", e.headers.get("ETag") or etag, error)
+    except (urllib.error.URLError, OSError) as e:
+        return FetchResult(0, "", None, str(e))
+
+#%% Host Scheduler
+SCHEDULER_POLICIES = ("fixed", "per-host", "adaptive")
+# Responses that mean the origin wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+MAX_FETCH_RETRIES = 2
+
+
+class _HostState:
+    __slots__ = ("limit", "rate", "tokens", "active", "updated", "latency", "paused_until", "strikes")
+
+    def __init__(self, limit: float, rate: float):
+        self.limit = limit
+        self.rate = rate
+        self.tokens = max(1.0, rate)
+        self.active = 0
+        self.updated = time.monotonic()
+        self.latency: float | None = None
+        self.paused_until = 0.0
+        self.strikes = 0
+
+    def refill(self, now: float) -> None:
+        # Token bucket: `rate` requests per second with a burst of max(1, rate)
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostScheduler:
+    """Decide when a fetch worker may hit a host.
+
+    ``fixed`` only enforces the global cap (the old ``concurrency=5`` behaviour).
+    ``per-host`` adds a concurrency limit and a token-bucket request rate per host.
+    ``adaptive`` starts from the per-host limits and adjusts them AIMD-style:
+    additive increase while latency stays near the host's baseline, multiplicative
+    decrease plus a pause when the host slows down or answers 429/503.
+    """
+
+    def __init__(self, policy: str = "fixed", global_limit: int = 5, host_limit: int = 2,
+                 host_rate: float = 4.0, max_host_limit: int = 16):
+        if policy not in SCHEDULER_POLICIES:
+            raise ValueError(f"Unknown scheduler policy: {policy}")
+        self.policy = policy
+        self.global_limit = global_limit
+        self.host_limit = host_limit
+        self.host_rate = host_rate
+        self.max_host_limit = max_host_limit
+        self._active = 0
+        self._hosts: dict[str, _HostState] = {}
+        self._cond = threading.Condition()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            if self.policy == "fixed":
+                state = _HostState(float("inf"), float("inf"))
+            else:
+                state = _HostState(float(self.host_limit), self.host_rate)
+            self._hosts[host] = state
+        return state
+
+    def acquire(self, host: str) -> None:
+        with self._cond:
+            state = self._state(host)
+            while True:
+                now = time.monotonic()
+                if self.policy != "fixed":
+                    state.refill(now)
+                ready = (
+                    self._active < self.global_limit
+                    and state.active + 1 <= state.limit
+                    and now >= state.paused_until
+                    and (self.policy == "fixed" or state.tokens >= 1.0)
+                )
+                if ready:
+                    if self.policy != "fixed":
+                        state.tokens -= 1.0
+                    state.active += 1
+                    self._active += 1
+                    return
+                # Sleep until a slot frees up, the pause ends or the next token arrives
+                timeout = None
+                if now < state.paused_until:
+                    timeout = state.paused_until - now
+                elif self.policy != "fixed" and state.tokens < 1.0:
+                    timeout = (1.0 - state.tokens) / state.rate
+                self._cond.wait(timeout)
+
+    def release(self, host: str, latency: float, status: int) -> None:
+        with self._cond:
+            state = self._state(host)
+            state.active -= 1
+            self._active -= 1
+            if self.policy != "fixed":
+                self._observe(state, latency, status)
+            self._cond.notify_all()
+
+    def _observe(self, state: _HostState, latency: float, status: int) -> None:
+        throttled = status in THROTTLE_STATUSES or status == 0
+        if throttled:
+            # Back off exponentially while the host keeps pushing back
+            state.strikes += 1
+            state.paused_until = time.monotonic() + min(60.0, 2.0 ** state.strikes)
+        else:
+            state.strikes = 0
+        baseline = state.latency if state.latency is not None else latency
+        state.latency = 0.8 * baseline + 0.2 * latency
+        if self.policy != "adaptive":
+            return
+
+        if throttled or latency > 2.0 * baseline:
+            state.limit = max(1.0, state.limit / 2)
+            state.rate = max(0.5, state.rate / 2)
+        else:
+            state.limit = min(float(self.max_host_limit), state.limit + 1.0 / state.limit)
+            state.rate = min(self.host_rate * self.max_host_limit, state.rate + 0.5)
+
+    def summary(self) -> list[str]:
+        with self._cond:
+            return [
+                f"{host}: limit={state.limit:.1f} rate={state.rate:.1f}/s latency={state.latency or 0.0:.3f}s"
+                for host, state in sorted(self._hosts.items())
+            ]
+
+#%% Incremental Index
+INDEX_NAME = ".sitemap_index.json"
+
+
+class IndexEntry(NamedTuple):
+    lastmod: str | None
+    etag: str | None
+    sha1: str | None
+
+
+class SitemapIndex:
+    """Compact URL -> (lastmod, etag, sha1 of Markdown) index used by incremental recrawls.
+
+    Worker processes (``shard`` set) save only the entries they touched, with ``null``
+    marking dropped URLs, and the parent folds those deltas into the shared index.
+    """
+
+    def __init__(self, output_dir: str, shard: int | None = None):
+        self.path = Path(output_dir) / INDEX_NAME
+        self.shard_path = shard_path(output_dir, INDEX_NAME, shard) if shard is not None else None
+        self.entries: dict[str, IndexEntry] = {}
+        self._touched: set[str] = set()
+        if self.path.exists():
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = {url: IndexEntry(*values) for url, values in raw.items()}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> IndexEntry | None:
+        return self.entries.get(url)
+
+    def update(self, url: str, lastmod: str | None, etag: str | None, content_hash: str | None) -> None:
+        with self._lock:
+            self.entries[url] = IndexEntry(lastmod, etag, content_hash)
+            self._touched.add(url)
+
+    def discard(self, urls: set[str]) -> None:
+        # Forget pages whose write failed so the next run fetches them again
+        with self._lock:
+            for url in urls:
+                self.entries.pop(url, None)
+                self._touched.add(url)
+
+    def save(self) -> None:
+        if self.shard_path is not None:
+            target = self.shard_path
+            data = {url: list(self.entries[url]) if url in self.entries else None for url in self._touched}
+        else:
+            target = self.path
+            data = {url: list(entry) for url, entry in self.entries.items()}
+        # Write to a temp file and swap it in so a crash never leaves a torn index
+        tmp_path = target.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, target)
+
+#%% Writer Stage
+
+
+class MarkdownWriter:
+    """Writer stage fed by a bounded queue so crawl callbacks never touch the disk.
+
+    A single drain thread pulls batches off the queue, creates every new parent
+    directory once per batch and fans the file writes out to a thread pool.
+    When the queue is full, ``submit`` blocks, which pushes back on the crawler.
+    """
+
+    def __init__(
+        self,
+        stats: StageStats,
+        queue_size: int = 256,
+        batch_size: int = 32,
+        threads: int = 4,
+        journal: CheckpointJournal | None = None,
+        output_dir: str = ".",
+        known_dirs: set[Path] | None = None,
+        verbose: bool = True,
+    ):
+        self.stats = stats
+        self.verbose = verbose
+        self.journal = journal
+        self.output_dir = Path(output_dir)
+        self.batch_size = batch_size
+        self.errors = 0
+        self.blocked_seconds = 0.0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="md-writer")
+        # Directories already created upstream (e.g. by the path planner) are skipped
+        self._known_dirs: set[Path] = known_dirs if known_dirs is not None else set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._drain, name="md-writer-stage", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+
+    def submit(self, url: str, path: Path, content: str) -> None:
+        # Fast path: hand the page over without waiting; only a full queue blocks
+        try:
+            self._queue.put_nowait((url, path, content))
+        except queue.Full:
+            started = time.perf_counter()
+            self._queue.put((url, path, content))
+            with self._lock:
+                self.blocked_seconds += time.perf_counter() - started
+
+    def _drain(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = any(item is _STOP for item in batch)
+            pages = [item for item in batch if item is not _STOP]
+            try:
+                self._write_batch(pages)
+            except Exception as e:
+                # A dead drain thread would leave submit() blocked on a full queue forever,
+                # so fail this batch and keep draining
+                for url, path, _ in pages:
+                    self._fail(url, path, e)
+
+    def _fail(self, url: str, path: Path, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+        print(f"Error writing {path}: {error}")
+        if self.journal is not None:
+            self.journal.record(url, "failed")
+
+    def _write_batch(self, batch: list[tuple[str, Path, str]]) -> None:
+        # Batched directory creation: one mkdir per new directory, not per page
+        new_dirs = {path.parent for _, path, _ in batch} - self._known_dirs
+        failed_dirs = {}
+        for directory in sorted(new_dirs):
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                failed_dirs[directory] = e
+            else:
+                self._known_dirs.add(directory)
+        writable = []
+        for url, path, content in batch:
+            if path.parent in failed_dirs:
+                self._fail(url, path, failed_dirs[path.parent])
+            else:
+                writable.append((url, path, content))
+        wait([self._pool.submit(self._write_file, url, path, content) for url, path, content in writable])
+
+    def _write_file(self, url: str, path: Path, content: str) -> None:
+        started = time.perf_counter()
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        except (OSError, ValueError) as e:
+            self._fail(url, path, e)
+            return
+        self.stats.add(time.perf_counter() - started)
+        # Journal only after the file is on disk, so a resumed run never trusts a lost write
+        if self.journal is not None:
+            content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+            self.journal.record(url, "saved", content_hash, path.relative_to(self.output_dir).as_posix())
+        if self.verbose:
+            print(f"Saved: {path}")
+
+#%% Bundle Output
+BUNDLE_FORMATS = ("files", "jsonl.gz", "jsonl.zst", "tar")
+BUNDLE_INDEX_NAME = ".bundle_index.jsonl"
+BUNDLE_PREFIX = "pages"
+
+
+def _compress(data: bytes, output_format: str) -> bytes:
+    if output_format == "jsonl.zst":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    # tar members are stored gzip'd too, so every format keeps one compressed blob per page
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, output_format: str) -> bytes:
+    if output_format == "jsonl.zst":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class BundleWriter(MarkdownWriter):
+    """Writer stage that appends pages to rolling compressed shards instead of one file per page.
+
+    ``jsonl.gz``/``jsonl.zst`` shards hold one JSON line per page, each compressed as its
+    own gzip member or zstd frame, so a whole shard still streams as one .gz/.zst file.
+    ``tar`` shards hold one gzip'd member per page, named by its planned path. Every page
+    gets a (shard, offset, length) line in ``.bundle_index.jsonl``, so a single page can be
+    read back with one seek. Pages are compressed on the thread pool and appended in order
+    by the drain thread; a shard rolls over once it passes ``shard_bytes``.
+    """
+
+    def __init__(self, stats: StageStats, output_format: str = "jsonl.gz", shard_bytes: int = 256 * 1024 * 1024,
+                 shard: int | None = None, **kwargs):
+        if output_format not in BUNDLE_FORMATS[1:]:
+            raise ValueError(f"Unknown bundle format: {output_format}")
+        if output_format == "jsonl.zst" and zstandard is None:
+            raise ValueError("The jsonl.zst format needs the zstandard package: pip install zstandard")
+        super().__init__(stats, **kwargs)
+        self.output_format = output_format
+        self.shard_bytes = shard_bytes
+        self._prefix = BUNDLE_PREFIX if shard is None else f"{BUNDLE_PREFIX}.shard-{shard:02d}"
+        # Never append to shards from earlier runs; start after the highest existing number
+        existing = [path.name for path in self.output_dir.glob(f"{self._prefix}-*.{output_format}")]
+        self._sequence = max((int(name[len(self._prefix) + 1:].split(".", 1)[0]) for name in existing), default=-1)
+        self._index_file = open(shard_path(self.output_dir, BUNDLE_INDEX_NAME, shard), "a", encoding="utf-8")
+        self._shard_name = ""
+        self._shard_file = None
+        self._tar: tarfile.TarFile | None = None
+
+    def __exit__(self, *exc_info):
+        super().__exit__(*exc_info)
+        self._close_shard()
+        self._index_file.close()
+
+    def _open_shard(self) -> None:
+        self._sequence += 1
+        self._shard_name = f"{self._prefix}-{self._sequence:05d}.{self.output_format}"
+        if self.output_format == "tar":
+            self._tar = tarfile.open(self.output_dir / self._shard_name, "w", format=tarfile.PAX_FORMAT)
+            self._shard_file = self._tar.fileobj
+        else:
+            self._shard_file = open(self.output_dir / self._shard_name, "wb")
+
+    def _close_shard(self) -> None:
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+        elif self._shard_file is not None:
+            self._shard_file.close()
+        self._shard_file = None
+
+    def _encode(self, item: tuple[str, Path, str]) -> tuple[bytes, float]:
+        url, path, content = item
+        started = time.perf_counter()
+        if self.output_format == "tar":
+            data = content.encode("utf-8")
+        else:
+            relative = path.relative_to(self.output_dir).as_posix()
+            data = (json.dumps({"url": url, "path": relative, "markdown": content}) + "\n").encode("utf-8")
+        return _compress(data, self.output_format), time.perf_counter() - started
+
+    def _write_batch(self, batch: list[tuple[str, Path, str]]) -> None:
+        encoded = list(self._pool.map(self._encode, batch))
+        lines = []
+        for (url, path, content), (blob, encode_seconds) in zip(batch, encoded):
+            started = time.perf_counter()
+            try:
+                if self._shard_file is None:
+                    self._open_shard()
+                relative = path.relative_to(self.output_dir).as_posix()
+                if self._tar is not None:
+                    info = tarfile.TarInfo(relative + ".gz")
+                    info.size = len(blob)
+                    info.mtime = int(time.time())
+                    self._tar.addfile(info, io.BytesIO(blob))
+                    # addfile() works on a copy of info, so derive the data offset from the
+                    # archive position: the member data is the last 512-byte-padded block run
+                    offset = self._tar.offset - math.ceil(len(blob) / tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+                else:
+                    offset = self._shard_file.tell()
+                    self._shard_file.write(blob)
+                self._shard_file.flush()
+            except OSError as e:
+                with self._lock:
+                    self.errors += 1
+                print(f"Error writing {url} to {self._shard_name}: {e}")
+                if self.journal is not None:
+                    self.journal.record(url, "failed")
+                continue
+
+            location = {
+                "url": url,
+                "shard": self._shard_name,
+                "format": self.output_format,
+                "offset": offset,
+                "length": len(blob),
+                "path": relative,
+            }
+            lines.append(json.dumps(location) + "\n")
+            self.stats.add(encode_seconds + time.perf_counter() - started)
+            if self.journal is not None:
+                content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+                self.journal.record(url, "saved", content_hash, f"{self._shard_name}:{offset}")
+            if self.verbose:
+                print(f"Saved: {url} -> {self._shard_name}@{offset}")
+            if self._shard_file.tell() >= self.shard_bytes:
+                self._close_shard()
+
+        self._index_file.writelines(lines)
+        self._index_file.flush()
+
+
+def load_bundle_index(output_dir: str) -> dict[str, dict]:
+    # Later lines win, so pages rewritten by incremental runs resolve to their newest copy
+    index = {}
+    with open(Path(output_dir) / BUNDLE_INDEX_NAME, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            index[entry["url"]] = entry
+    return index
+
+
+def read_bundle_page(output_dir: str, entry: dict) -> str:
+    # Random access: one seek and one read of exactly the page's compressed bytes
+    output_format = entry["format"]
+    with open(Path(output_dir) / entry["shard"], "rb") as f:
+        f.seek(entry["offset"])
+        data = _decompress(f.read(entry["length"]), output_format)
+    if output_format == "tar":
+        return data.decode("utf-8")
+    return json.loads(data)["markdown"]
+
+
+def remove_bundles(output_dir: str) -> None:
+    # Fresh (non-resumed, non-incremental) runs start without stale shards
+    out = Path(output_dir)
+    for path in out.glob(f"{BUNDLE_PREFIX}*-*.*"):
+        if path.name.endswith(tuple(BUNDLE_FORMATS[1:])):
+            path.unlink()
+    base, ext = BUNDLE_INDEX_NAME.rsplit(".", 1)
+    for path in [out / BUNDLE_INDEX_NAME, *out.glob(f"{base}.shard-*.{ext}")]:
+        path.unlink(missing_ok=True)
+
+#%% Path and Markdown Helpers
+MANIFEST_NAME = ".sitemap_manifest.jsonl"
+
+
+def url_to_relative_path(url: str) -> Path:
+    # Determine the file path based on the URL path
+    parsed_url = urlparse(url)
+    # Decode URL-encoded characters in the path
+    url_path = unquote(parsed_url.path.lstrip('/'))
+
+    # Handle index pages (e.g., /about/ -> /about/index.md)
+    if not url_path or url_path.endswith('/'):
+        file_name = "index.md"
+    else:
+        # Ensure it ends with .md, handling cases with existing extensions
+        path_parts = url_path.split('/')
+        last_part = path_parts[-1]
+        if '.' in last_part:  # Check if there's an extension
+            file_name = os.path.splitext(last_part)[0] + ".md"
+        else:
+            file_name = last_part + ".md"
+        # Reconstruct path without the original last part
+        url_path = '/'.join(path_parts[:-1])
+
+    return Path(url_path) / file_name
+
+
+class PathPlanner:
+    """Plan collision-free output paths for batches of URLs and record them in a manifest.
+
+    Paths are assigned once per URL and persisted to ``.sitemap_manifest.jsonl``, so
+    resumed and incremental runs reuse them. When two URLs map to the same file
+    (``/a/b.html`` and ``/a/b.php``, or pages that differ only by query string), the
+    later one gets a stable ``-<sha1(url)[:8]>`` suffix instead of overwriting.
+    """
+
+    def __init__(self, output_dir: str, keep_manifest: bool = False, shard: int | None = None,
+                 create_dirs: bool = True):
+        self.output_dir = Path(output_dir)
+        # Bundle output formats never touch the directory tree
+        self.create_dirs = create_dirs
+        self.path = shard_path(output_dir, MANIFEST_NAME, shard)
+        canonical = self.output_dir / MANIFEST_NAME
+        self.assigned: dict[str, str] = {}
+        # Claimed paths are keyed case-insensitively so macOS/Windows checkouts cannot collide either
+        self._claimed: dict[str, str] = {}
+        self.created_dirs: set[Path] = set()
+        # Directories mkdir refused (name too long, a file in the way); their URLs fail
+        self.failed_dirs: dict[Path, OSError] = {}
+        if keep_manifest and canonical.exists():
+            with open(canonical, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.assigned[entry["url"]] = entry["path"]
+                    self._claimed[entry["path"].casefold()] = entry["url"]
+        self._file = open(self.path, "a" if keep_manifest and shard is None else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _claim(self, url: str) -> str:
+        relative_path = url_to_relative_path(url)
+        candidate = relative_path.as_posix()
+        # Query strings are dropped from the file name, so such URLs are always suffixed;
+        # that keeps "/a/b" on b.md regardless of which variant the sitemap lists first
+        if urlparse(url).query or candidate.casefold() in self._claimed:
+            suffix = hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+            candidate = relative_path.with_name(f"{relative_path.stem}-{suffix}.md").as_posix()
+        self._claimed[candidate.casefold()] = url
+        self.assigned[url] = candidate
+        return candidate
+
+    def plan(self, urls: list[str]) -> list[Path]:
+        with self._lock:
+            lines = []
+            paths = []
+            for url in urls:
+                relative_path = self.assigned.get(url)
+                if relative_path is None:
+                    relative_path = self._claim(url)
+                    lines.append(json.dumps({"url": url, "path": relative_path}) + "\n")
+                paths.append(self.output_dir / relative_path)
+
+            # Pre-create the directory tree for the whole batch in one pass
+            if self.create_dirs:
+                new_dirs = {path.parent for path in paths} - self.created_dirs - self.failed_dirs.keys()
+                for directory in sorted(new_dirs):
+                    try:
+                        directory.mkdir(parents=True, exist_ok=True)
+                    except OSError as e:
+                        print(f"Could not create directory {directory}: {e}")
+                        self.failed_dirs[directory] = e
+                    else:
+                        self.created_dirs.add(directory)
+
+            self._file.writelines(lines)
+            self._file.flush()
+            return paths
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def iter_planned(entries: Iterable[SitemapEntry], planner: PathPlanner,
+                 batch_size: int = 256) -> Iterator[tuple[SitemapEntry, Path]]:
+    # Group streamed entries into batches so paths and directories are planned up front
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield from zip(batch, planner.plan([item.url for item in batch]))
+            batch = []
+    if batch:
+        yield from zip(batch, planner.plan([item.url for item in batch]))
+
+
+def html_to_markdown(generator: DefaultMarkdownGenerator, html_content: str, url: str) -> str:
+    # Convert the HTML the sitemap crawl already fetched, so no second request is made
+    result = generator.generate_markdown(input_html=html_content, base_url=url)
+    return result.raw_markdown or ""
 
 #%% Sitemap Crawler Function
-def crawl_and_save_sitemap(sitemap_url: str, output_dir: str):
+def crawl_and_save_sitemap(
+    sitemap_url: str,
+    output_dir: str,
+    pipeline: bool = False,
+    writer_threads: int = 4,
+    resume: bool = False,
+    incremental: bool = False,
+    concurrency: int = 5,
+    policy: str = "fixed",
+    host_concurrency: int = 2,
+    host_rate: float = 4.0,
+    verbose: bool = True,
+    output_format: str = "files",
+    shard_bytes: int = 256 * 1024 * 1024,
+    workers: int = 1,
+    entries: Iterable[SitemapEntry] | None = None,
+    shard: int | None = None,
+    on_page: Callable[[], None] | None = None,
+):
+    if workers > 1:
+        # Sharded mode: a parent process streams the sitemap to per-shard worker processes
+        return crawl_sharded(
+            sitemap_url,
+            output_dir,
+            workers,
+            writer_threads=writer_threads,
+            resume=resume,
+            incremental=incremental,
+            concurrency=concurrency,
+            policy=policy,
+            host_concurrency=host_concurrency,
+            host_rate=host_rate,
+            verbose=verbose,
+            output_format=output_format,
+            shard_bytes=shard_bytes,
+        )
+
     # Initialize the crawler
     crawler = Crawl4ai()
+    # Pipeline and incremental modes expand the sitemap themselves (or read entries
+    # handed over by a parent process), fetch each page once and convert the HTML
+    # in-process instead of scraping each URL again. Only those fetch workers go
+    # through the HostScheduler, so a per-host policy turns streaming on too.
+    streaming = pipeline or incremental or entries is not None or policy != "fixed"
+    generator = DefaultMarkdownGenerator() if streaming else None
+    stats = {name: StageStats(name) for name in ("fetch", "convert", "write")}
 
     # Create the base output directory if it doesn't exist
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     print(f"Output directory: {Path(output_dir).resolve()}")
+    if shard is None:
+        # Fold in metadata left behind by worker processes of an interrupted sharded run
+        merge_shard_files(output_dir)
+        if output_format != "files" and not (resume or incremental):
+            remove_bundles(output_dir)
+
+    # Append-only checkpoint journal; --resume replays it to skip finished URLs
+    journal = CheckpointJournal(output_dir, resume=resume, shard=shard)
+    if resume:
+        print(f"Resuming: {len(journal.done)} URLs already saved")
+    index = SitemapIndex(output_dir, shard=shard) if incremental else None
+    # The scheduler decides when a fetch worker may hit a given host
+    scheduler = HostScheduler(policy, global_limit=concurrency, host_limit=host_concurrency, host_rate=host_rate)
+    # Keep earlier path assignments whenever this run builds on a previous one
+    planner = PathPlanner(
+        output_dir, keep_manifest=resume or incremental, shard=shard, create_dirs=output_format == "files"
+    )
+    tally = {"skipped": 0, "unchanged": 0}
+    tally_lock = threading.Lock()
+    writer_options = dict(
+        threads=writer_threads,
+        journal=journal,
+        output_dir=output_dir,
+        known_dirs=planner.created_dirs,
+        verbose=verbose,
+    )
+    if output_format == "files":
+        writer = MarkdownWriter(stats["write"], **writer_options)
+    else:
+        # Bundle formats append pages to rolling compressed shards with an offset index
+        writer = BundleWriter(stats["write"], output_format, shard_bytes, shard=shard, **writer_options)
+
+    def count(key: str) -> None:
+        with tally_lock:
+            tally[key] += 1
+
+    def handle_page(url: str, path: Path, html_content: str, previous: IndexEntry | None = None,
+                    lastmod: str | None = None, etag: str | None = None):
+        if verbose:
+            print(f"Processing: {url}")
+        try:
+            started = time.perf_counter()
+            if generator is not None:
+                content = html_to_markdown(generator, html_content or "", url)
+            else:
+                # Scrape content as Markdown
+                result = crawler.scrape(url=url, output_format="markdown")
+                content = result.content if result else ""
+            stats["convert"].add(time.perf_counter() - started)
+
+            if not content:
+                print(f"No content scraped from {url}")
+                journal.record(url, "empty")
+                return
+
+            if index is not None:
+                content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+                index.update(url, lastmod, etag, content_hash)
+                # Same Markdown as last run: the file on disk is already current
+                if previous is not None and previous.sha1 == content_hash:
+                    count("unchanged")
+                    journal.record(url, "unchanged", content_hash, path.relative_to(output_dir).as_posix())
+                    return
+
+            # Hand the page to the writer stage; its directory was created by the planner
+            writer.submit(url, path, content)
+
+        except Exception as e:
+            print(f"Error processing {url}: {e}")
+            journal.record(url, "failed")
+
+    def directory_failed(url: str, path: Path) -> bool:
+        # One URL whose directory cannot be created fails on its own, not the whole crawl
+        error = planner.failed_dirs.get(path.parent)
+        if error is None:
+            return False
+        print(f"Error processing {url}: {error}")
+        journal.record(url, "failed")
+        return True
 
     def process_url(url: str, success: bool, html_content: str, error_message: str | None):
+        if url in journal.done:
+            count("skipped")
+            return
+
         if not success:
             print(f"Failed to crawl {url}: {error_message}")
+            journal.record(url, "failed")
             return
 
-        print(f"Processing: {url}")
+        stats["fetch"].add(0.0)
         try:
-            # Scrape content as Markdown
-            result = crawler.scrape(url=url, output_format="markdown")
+            path = planner.plan([url])[0]
+        except OSError as e:
+            print(f"Error processing {url}: {e}")
+            journal.record(url, "failed")
+            return
+        if not directory_failed(url, path):
+            handle_page(url, path, html_content)
 
-            if not result or not result.content:
-                print(f"No content scraped from {url}")
-                return
+    def process_entry(planned: tuple[SitemapEntry, Path]):
+        entry, path = planned
+        if entry.url in journal.done:
+            count("skipped")
+            return
+        if directory_failed(entry.url, path):
+            return
+
+        # An unchanged <lastmod> means the page has not changed: skip it without a request
+        previous = index.get(entry.url) if index is not None else None
+        if previous is not None and entry.lastmod and previous.lastmod == entry.lastmod:
+            count("unchanged")
+            return
+
+        host = urlparse(entry.url).netloc
+        for attempt in range(MAX_FETCH_RETRIES + 1):
+            scheduler.acquire(host)
+            started = time.perf_counter()
+            fetched = fetch_page(entry.url, previous.etag if previous else None)
+            elapsed = time.perf_counter() - started
+            scheduler.release(host, elapsed, fetched.status)
+            # Throttled requests are retried once the scheduler lets the host back in
+            if fetched.status not in THROTTLE_STATUSES:
+                break
+        stats["fetch"].add(elapsed)
+        if fetched.status == 304 and previous is not None:
+            count("unchanged")
+            index.update(entry.url, entry.lastmod, fetched.etag, previous.sha1)
+            return
+        if fetched.error:
+            print(f"Failed to crawl {entry.url}: {fetched.error}")
+            journal.record(entry.url, "failed")
+            return
 
-            # Determine the file path based on the URL path
-            parsed_url = urlparse(url)
-            # Decode URL-encoded characters in the path
-            url_path = unquote(parsed_url.path.lstrip('/'))
+        handle_page(entry.url, path, fetched.html, previous, entry.lastmod, fetched.etag)
 
-            # Handle index pages (e.g., /about/ -> /about/index.md)
-            if not url_path or url_path.endswith('/'):
-                file_name = "index.md"
+    def process_and_report(planned: tuple[SitemapEntry, Path]):
+        try:
+            process_entry(planned)
+        finally:
+            on_page()
+
+    # Start crawling the sitemap
+    print(f"Starting crawl for sitemap: {sitemap_url}")
+    started = time.perf_counter()
+    try:
+        with writer:
+            if streaming:
+                # Entries flow from the streaming (nested, gzip-aware) sitemap parser
+                # straight into the fetch workers as they are parsed
+                source = entries if entries is not None else iter_sitemap_entries(sitemap_url)
+                planned = iter_planned(source, planner)
+                # Per-host policies park workers on busy hosts, so run extra workers to keep
+                # other hosts busy; the scheduler still enforces the global cap
+                fetch_threads = concurrency if policy == "fixed" else concurrency * 4
+                run_bounded(process_entry if on_page is None else process_and_report, planned, fetch_threads)
             else:
-                # Ensure it ends with .md, handling cases with existing extensions
-                path_parts = url_path.split('/')
-                last_part = path_parts[-1]
-                if '.' in last_part:  # Check if there's an extension
-                    file_name = os.path.splitext(last_part)[0] + ".md"
+                crawler.crawl_sitemap(
+                    sitemap_url=sitemap_url,
+                    callback=process_url,
+                    # You can adjust concurrency if needed
+                    concurrency=concurrency
+                )
+    finally:
+        journal.close()
+        planner.close()
+        if index is not None:
+            index.discard(journal.failed)
+            index.save()
+    print(
+        f"Sitemap crawl finished. Skipped {tally['skipped']} already-saved URLs, "
+        f"{tally['unchanged']} unchanged."
+    )
+    print_stage_report(stats, time.perf_counter() - started)
+    if streaming and policy != "fixed":
+        print(f"Host scheduler ({policy}):")
+        for line in scheduler.summary():
+            print(f"  {line}")
+    print(f"Crawler blocked on writer backpressure for {writer.blocked_seconds:.2f}s ({writer.errors} write errors)")
+    return stats
+
+#%% Sharded Multi-Process Crawl
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring mapping shard keys to worker ids, 64 virtual nodes per worker."""
+
+    def __init__(self, shards: int, replicas: int = 64):
+        points = sorted((_ring_hash(f"{shard}:{replica}"), shard) for shard in range(shards) for replica in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> int:
+        position = bisect.bisect(self._hashes, _ring_hash(key)) % len(self._hashes)
+        return self._shards[position]
+
+
+def shard_key(url: str) -> str:
+    # URLs that could collide on an output path (b.html vs b.php) must land on the same
+    # worker, so each worker owns a disjoint set of files in the shared output tree
+    return url_to_relative_path(url).with_suffix("").as_posix().casefold()
+
+
+def merge_shard_files(output_dir: str) -> None:
+    # Fold per-worker journal, manifest and index files into the shared ones
+    out = Path(output_dir)
+    for name in (JOURNAL_NAME, MANIFEST_NAME, BUNDLE_INDEX_NAME):
+        base, ext = name.rsplit(".", 1)
+        shard_files = sorted(out.glob(f"{base}.shard-*.{ext}"))
+        if not shard_files:
+            continue
+        with open(out / name, "a", encoding="utf-8") as merged:
+            for shard_file in shard_files:
+                text = shard_file.read_text(encoding="utf-8")
+                # Terminate a torn last line so it cannot swallow the next shard's first entry
+                merged.write(text if not text or text.endswith("\n") else text + "\n")
+                shard_file.unlink()
+
+    base, ext = INDEX_NAME.rsplit(".", 1)
+    shard_files = sorted(out.glob(f"{base}.shard-*.{ext}"))
+    if shard_files:
+        index = SitemapIndex(output_dir)
+        for shard_file in shard_files:
+            for url, values in json.loads(shard_file.read_text(encoding="utf-8")).items():
+                if values is None:
+                    index.entries.pop(url, None)
                 else:
-                    file_name = last_part + ".md"
-                # Reconstruct path without the original last part
-                url_path = '/'.join(path_parts[:-1])
+                    index.entries[url] = IndexEntry(*values)
+        index.save()
+        for shard_file in shard_files:
+            shard_file.unlink()
 
-            # Construct the full path within the output directory
-            relative_dir = Path(url_path)
-            full_dir_path = Path(output_dir) / relative_dir
-            full_file_path = full_dir_path / file_name
 
-            # Create necessary directories
-            full_dir_path.mkdir(parents=True, exist_ok=True)
+def _shard_worker(shard: int, entry_queue, events, sitemap_url: str, output_dir: str, options: dict) -> None:
+    def entries() -> Iterator[SitemapEntry]:
+        while True:
+            item = entry_queue.get()
+            if item is None:
+                return
+            yield SitemapEntry(*item)
 
-            # Save the Markdown content
-            with open(full_file_path, "w", encoding="utf-8") as f:
-                f.write(result.content)
-            print(f"Saved: {full_file_path}")
+    processed = 0
+    lock = threading.Lock()
 
-        except Exception as e:
-            print(f"Error processing {url}: {e}")
+    def on_page() -> None:
+        nonlocal processed
+        with lock:
+            processed += 1
+            if processed % 50 == 0:
+                events.put(("progress", shard, processed))
 
-    # Start crawling the sitemap
-    print(f"Starting crawl for sitemap: {sitemap_url}")
-    crawler.crawl_sitemap(
-        sitemap_url=sitemap_url,
-        callback=process_url,
-        # You can adjust concurrency if needed
-        concurrency=5
+    stats = crawl_and_save_sitemap(
+        sitemap_url, output_dir, entries=entries(), shard=shard, on_page=on_page, **options
     )
-    print("Sitemap crawl finished.")
+    events.put((
+        "done", shard, processed,
+        {name: (stage.pages, stage.busy_seconds, stage.samples) for name, stage in stats.items()},
+    ))
+
+
+def _put(target_queue, item, process) -> None:
+    # Never block forever on a queue whose consumer died
+    while True:
+        try:
+            target_queue.put(item, timeout=1.0)
+            return
+        except queue.Full:
+            if not process.is_alive():
+                raise RuntimeError(f"Worker {process.name} exited unexpectedly")
+
+
+def crawl_sharded(sitemap_url: str, output_dir: str, workers: int, **options):
+    """Shard the sitemap across ``workers`` processes by consistent hash.
+
+    The parent streams the sitemap and routes each entry to its worker through a
+    bounded queue. Each worker runs its own fetch/convert/write pipeline and writes
+    its own journal, manifest and index files. The parent reports merged progress
+    and folds the per-worker metadata into the shared files when the workers finish.
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    merge_shard_files(output_dir)
+    if not options.get("resume"):
+        (out / JOURNAL_NAME).unlink(missing_ok=True)
+    if not (options.get("resume") or options.get("incremental")):
+        (out / MANIFEST_NAME).unlink(missing_ok=True)
+        if options.get("output_format", "files") != "files":
+            remove_bundles(output_dir)
+
+    # Every worker runs its own scheduler, so split the per-host budget to stay polite overall
+    worker_options = dict(
+        options,
+        host_concurrency=max(1, math.ceil(options.get("host_concurrency", 2) / workers)),
+        host_rate=options.get("host_rate", 4.0) / workers,
+    )
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    queues = [context.Queue(maxsize=1024) for _ in range(workers)]
+    processes = [
+        context.Process(
+            target=_shard_worker,
+            args=(shard, queues[shard], events, sitemap_url, output_dir, worker_options),
+            name=f"sitemap-shard-{shard:02d}",
+        )
+        for shard in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    ring = HashRing(workers)
+    progress = [0] * workers
+    finished: dict[int, dict] = {}
+    last_report = time.monotonic()
+
+    def handle(event) -> None:
+        nonlocal last_report
+        if event[0] == "progress":
+            progress[event[1]] = event[2]
+        else:
+            progress[event[1]] = event[2]
+            finished[event[1]] = event[3]
+        if time.monotonic() - last_report >= 5.0:
+            last_report = time.monotonic()
+            print(f"Progress: {sum(progress)} pages across {workers} workers {progress}")
+
+    print(f"Starting sharded crawl for sitemap: {sitemap_url} ({workers} workers)")
+    started = time.perf_counter()
+    try:
+        for dispatched, entry in enumerate(iter_sitemap_entries(sitemap_url), 1):
+            shard = ring.shard_for(shard_key(entry.url))
+            _put(queues[shard], tuple(entry), processes[shard])
+            if dispatched % 500 == 0:
+                while True:
+                    try:
+                        handle(events.get_nowait())
+                    except queue.Empty:
+                        break
+    finally:
+        for shard, process in enumerate(processes):
+            if process.is_alive():
+                _put(queues[shard], None, process)
+
+    while len(finished) < workers:
+        try:
+            handle(events.get(timeout=5.0))
+        except queue.Empty:
+            if all(not process.is_alive() for shard, process in enumerate(processes) if shard not in finished):
+                print("Some workers exited without reporting; their pages are not in the totals.")
+                break
+    for process in processes:
+        process.join()
+    merge_shard_files(output_dir)
+
+    # Merge per-worker stage totals and latency samples into one report
+    stats = {name: StageStats(name) for name in ("fetch", "convert", "write")}
+    for worker_stats in finished.values():
+        for name, (pages, busy_seconds, samples) in worker_stats.items():
+            stats[name].pages += pages
+            stats[name].busy_seconds += busy_seconds
+            stats[name].samples.extend(samples)
+    print(f"Sharded crawl finished: {sum(progress)} pages across {workers} workers.")
+    print_stage_report(stats, time.perf_counter() - started)
+    return stats
 
 #%% Command Line Interface
 if __name__ == "__main__":
@@ -90,10 +1257,95 @@ if __name__ == "__main__":
         default="sitemap_output",
         help="The directory to save the scraped Markdown files (default: sitemap_output)."
     )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Stream the sitemap (indexes and .xml.gz included), fetch each page once and convert it in-process."
+    )
+    parser.add_argument(
+        "--writer-threads",
+        type=int,
+        default=4,
+        help="Number of threads the writer stage uses for file writes (default: 4)."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Skip URLs recorded as saved in the checkpoint journal ({JOURNAL_NAME}) of a previous run."
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Only fetch pages whose <lastmod> or ETag changed and only rewrite changed Markdown ({INDEX_NAME})."
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Only print errors and the final report, not one line per page."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Number of pages fetched in parallel across all hosts (default: 5)."
+    )
+    parser.add_argument(
+        "--format",
+        choices=BUNDLE_FORMATS,
+        default="files",
+        help="Write one .md file per page, or append pages to rolling compressed shards with an offset index (default: files)."
+    )
+    parser.add_argument(
+        "--shard-mb",
+        type=int,
+        default=256,
+        help="Roll over to a new bundle shard after this many megabytes (default: 256)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Shard the sitemap across this many processes, each with its own crawler (implies --pipeline)."
+    )
+    parser.add_argument(
+        "--policy",
+        choices=SCHEDULER_POLICIES,
+        default="fixed",
+        help="Fetch scheduling: global cap only, per-host token buckets, or adaptive per-host limits; "
+             "per-host and adaptive imply --pipeline (default: fixed)."
+    )
+    parser.add_argument(
+        "--host-concurrency",
+        type=int,
+        default=2,
+        help="Starting concurrent requests per host for the per-host and adaptive policies (default: 2)."
+    )
+    parser.add_argument(
+        "--host-rate",
+        type=float,
+        default=4.0,
+        help="Starting requests per second per host for the per-host and adaptive policies (default: 4.0)."
+    )
 
     args = parser.parse_args()
-    crawl_and_save_sitemap(args.sitemap_url, args.output)
+    crawl_and_save_sitemap(
+        args.sitemap_url,
+        args.output,
+        pipeline=args.pipeline,
+        writer_threads=args.writer_threads,
+        resume=args.resume,
+        incremental=args.incremental,
+        concurrency=args.concurrency,
+        policy=args.policy,
+        host_concurrency=args.host_concurrency,
+        host_rate=args.host_rate,
+        verbose=not args.quiet,
+        output_format=args.format,
+        shard_bytes=args.shard_mb * 1024 * 1024,
+        workers=args.workers,
+    )
 
 #%% Interactive Testing
 # Uncomment and modify the line below to test interactively
-# crawl_and_save_sitemap("https://example.com/sitemap.xml", "test_output")
\ No newline at end of file
+# crawl_and_save_sitemap("https://example.com/sitemap.xml", "test_output")
@@ -0,0 +1,163 @@
+#%% Imports
+import argparse
+import json
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from crawl_sitmap import SCHEDULER_POLICIES, crawl_and_save_sitemap
+
+#%% Fixture Server
+def make_handler(pages: int, page_size: int, latency: float):
+    # Every page body is generated once up front so serving costs no CPU during the run
+    paragraph = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4 + "</p>\n"
+    body_repeats = max(1, page_size // len(paragraph))
+
+    def render_page(number: int) -> bytes:
+        return (
+            f"<html><head><title>Page {number}</title></head><body>"
+            f"<h1>Synthetic page {number}</h1>\n{paragraph * body_repeats}"
+            f'<a href="/pages/{(number + 1) % pages}.html">next</a></body></html>'
+        ).encode("utf-8")
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/sitemap.xml":
+                host = f"http://{self.headers['Host']}"
+                urls = "".join(f"<url><loc>{host}/pages/{i}.html</loc></url>" for i in range(pages))
+                self._send(
+                    b'<?xml version="1.0" encoding="UTF-8"?>'
+                    b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    + urls.encode("utf-8") + b"</urlset>",
+                    "application/xml",
+                )
+                return
+            if self.path.startswith("/pages/") and self.path.endswith(".html"):
+                try:
+                    number = int(self.path[len("/pages/"):-len(".html")])
+                except ValueError:
+                    number = -1
+                if 0 <= number < pages:
+                    # Simulated origin latency
+                    time.sleep(latency)
+                    self._send(render_page(number), "text/html; charset=utf-8")
+                    return
+            self.send_error(404)
+
+        def _send(self, body: bytes, content_type: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Keep the benchmark output readable
+            pass
+
+    return FixtureHandler
+
+
+def start_fixture_server(pages: int, page_size: int, latency: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(pages, page_size, latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server
+
+#%% Measurements
+def percentile(samples: list[float], pct: int) -> float:
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS; RUSAGE_CHILDREN
+    # covers the largest worker process of a sharded run
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def bytes_written(output_dir: Path) -> int:
+    # Exported content only: the journal, index, bundle index and manifest are all dotfiles
+    return sum(
+        path.stat().st_size
+        for path in output_dir.rglob("*")
+        if path.is_file() and not path.name.startswith(".")
+    )
+
+#%% Benchmark Runner
+def run_benchmark(pages: int, page_size: int, latency: float, concurrency: int, policy: str,
+                  output_dir: str | None = None, workers: int = 1) -> dict:
+    server = start_fixture_server(pages, page_size, latency)
+    sitemap_url = f"http://127.0.0.1:{server.server_address[1]}/sitemap.xml"
+    work_dir = Path(output_dir) if output_dir else Path(tempfile.mkdtemp(prefix="sitemap_bench_"))
+    try:
+        started = time.perf_counter()
+        stats = crawl_and_save_sitemap(
+            sitemap_url,
+            str(work_dir),
+            pipeline=True,
+            concurrency=concurrency,
+            policy=policy,
+            verbose=False,
+            workers=workers,
+        )
+        elapsed = time.perf_counter() - started
+        latencies = stats["fetch"].samples
+        report = {
+            "pages": pages,
+            "page_size": page_size,
+            "latency": latency,
+            "concurrency": concurrency,
+            "policy": policy,
+            "workers": workers,
+            "saved_pages": stats["write"].pages,
+            "elapsed_seconds": round(elapsed, 3),
+            "pages_per_sec": round(stats["write"].pages / elapsed, 2) if elapsed else 0.0,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "bytes_written": bytes_written(work_dir),
+        }
+        # Percentiles over zero fetches would read as 0 ms, so leave them out instead
+        if latencies:
+            for pct in (50, 95, 99):
+                report[f"latency_p{pct}_ms"] = round(percentile(latencies, pct) * 1000, 2)
+        return report
+    finally:
+        server.shutdown()
+        server.server_close()
+        if output_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+#%% Command Line Interface
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark crawl_and_save_sitemap against a local synthetic sitemap server."
+    )
+    parser.add_argument("--pages", type=int, default=500, help="Number of generated pages (default: 500).")
+    parser.add_argument("--page-size", type=int, default=20_000, help="Approximate HTML bytes per page (default: 20000).")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server-side delay per page in seconds (default: 0.02).")
+    parser.add_argument("--concurrency", type=int, default=5, help="Crawler concurrency (default: 5).")
+    parser.add_argument("--policy", choices=SCHEDULER_POLICIES, default="fixed", help="Fetch scheduling policy (default: fixed).")
+    parser.add_argument("--workers", type=int, default=1, help="Crawler processes (default: 1).")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Keep the exported Markdown here instead of a temp dir.")
+    parser.add_argument("--json", type=str, default=None, help="Also write the report as JSON to this path.")
+
+    args = parser.parse_args()
+    report = run_benchmark(args.pages, args.page_size, args.latency, args.concurrency, args.policy, args.output, args.workers)
+    print("Benchmark report:")
+    for key, value in report.items():
+        print(f"  {key:<16} {value}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
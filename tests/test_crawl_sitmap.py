@@ -0,0 +1,69 @@
+import json
+import threading
+
+import pytest
+
+try:
+    import crawl_sitmap
+except ImportError as e:  # Needs the crawl4ai release that still ships Crawl4ai
+    pytest.skip(f"crawl_sitmap unavailable: {e}", allow_module_level=True)
+
+from crawl_sitmap import JOURNAL_NAME, FetchResult, PathPlanner, SitemapEntry, crawl_and_save_sitemap
+
+HOST = "http://example.test"
+LONG_URL = f"{HOST}/{'x' * 300}/page.html"
+
+
+def journal_statuses(output_dir) -> dict[str, str]:
+    lines = (output_dir / JOURNAL_NAME).read_text(encoding="utf-8").splitlines()
+    return {entry["url"]: entry["status"] for entry in map(json.loads, lines)}
+
+
+def test_planner_records_directories_it_cannot_create(tmp_path):
+    planner = PathPlanner(str(tmp_path))
+    try:
+        good, long = planner.plan([f"{HOST}/docs/intro.html", LONG_URL])
+    finally:
+        planner.close()
+    assert good.parent.is_dir()
+    assert long.parent in planner.failed_dirs
+    assert long.parent not in planner.created_dirs
+
+
+def test_overlong_path_segment_fails_only_its_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_sitmap, "fetch_page", lambda url, etag=None: FetchResult(200, "<p>hello</p>", None))
+    urls = [f"{HOST}/before.html", LONG_URL, f"{HOST}/after.html"]
+    stats = crawl_and_save_sitemap(
+        f"{HOST}/sitemap.xml",
+        str(tmp_path),
+        entries=[SitemapEntry(url, None) for url in urls],
+        verbose=False,
+    )
+    assert stats["write"].pages == 2
+    assert journal_statuses(tmp_path) == {urls[0]: "saved", LONG_URL: "failed", urls[2]: "saved"}
+
+
+def test_writer_failure_fails_pages_instead_of_hanging(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_sitmap, "fetch_page", lambda url, etag=None: FetchResult(200, "<p>hello</p>", None))
+
+    def broken_batch(self, batch):
+        raise OSError("disk gone")
+
+    # The drain thread hits this on every batch; more pages than the queue holds
+    monkeypatch.setattr(crawl_sitmap.MarkdownWriter, "_write_batch", broken_batch)
+    urls = [f"{HOST}/page-{number}.html" for number in range(600)]
+    outcome = {}
+    crawl = threading.Thread(
+        target=lambda: outcome.update(stats=crawl_and_save_sitemap(
+            f"{HOST}/sitemap.xml",
+            str(tmp_path),
+            entries=[SitemapEntry(url, None) for url in urls],
+            verbose=False,
+        )),
+        daemon=True,
+    )
+    crawl.start()
+    crawl.join(timeout=60)
+    assert not crawl.is_alive()
+    assert outcome["stats"]["write"].pages == 0
+    assert set(journal_statuses(tmp_path).values()) == {"failed"}
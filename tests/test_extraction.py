@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from crawl4ai import JsonCssExtractionStrategy
+
+from c4a_series.common.extraction import CompiledCssExtractionStrategy
+
+PAGE = """
+<html><body>
+  <div class="card">
+    <pre>x<script>var a</script>y<style>.a{}</style>z</pre>
+    <p>before<template><span>hidden</span>t</template>after</p>
+    <ruby>漢<rt>kan</rt><rp>(</rp></ruby>
+    <script>inline()</script>
+    <template>outer<style>.b{}</style><em>inner</em></template>
+  </div>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("selector", ["pre", "p", "ruby", "script", "template", "template em", "rt"])
+def test_text_matches_stock_around_script_style_and_template(selector):
+    schema = {"name": "cards", "baseSelector": "div.card", "fields": [{"name": "value", "selector": selector, "type": "text"}]}
+    stock = JsonCssExtractionStrategy(schema).extract("u", PAGE)
+    assert CompiledCssExtractionStrategy(schema).extract("u", PAGE) == stock
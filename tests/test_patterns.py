@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from crawl4ai import RegexExtractionStrategy
+
+from c4a_series.common.patterns import OnePassRegexStrategy
+
+
+@pytest.mark.parametrize(
+    "custom, text",
+    [
+        # IGNORECASE folds ASCII "s" onto "ſ" (U+017F), so these two can overlap
+        ({"sku_code": r"sku-[0-9]{3}", "latin_ext": r"[Ā-ſ]+"}, "Āſku-123"),
+        ({"kit": r"kit-\d+", "symbol": r"[℀-⅏]+"}, "Kit-42"),
+        ({"id": r"id\d", "turkish": r"[İı]+"}, "İd7 ıd8"),
+    ],
+)
+def test_one_pass_matches_stock_under_case_folding(custom, text):
+    stock = RegexExtractionStrategy(custom=custom).extract("u", text)
+    assert OnePassRegexStrategy(custom=custom).extract("u", text) == stock
+    assert len(stock) > 1
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from c4a_series.common.schemas import SchemaStore
+
+RECORD = {"schema": {"name": "cards", "baseSelector": "div.card", "fields": []}, "query": "cards"}
+
+
+def test_load_keeps_previous_copy_while_file_is_partly_written(tmp_path):
+    store = SchemaStore(root=tmp_path)
+    path = store.path("example.com", "abc123", "cards")
+    store.save(path, RECORD)
+    assert store.load(path) == RECORD
+
+    path.write_text('{"schema": {"name": "car', encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert store.load(path) == RECORD
+    assert store.strategy(path) is not None
+
+
+def test_load_returns_none_for_unparseable_file_never_loaded(tmp_path):
+    store = SchemaStore(root=tmp_path)
+    path = store.path("example.com", "abc123", "cards")
+    path.parent.mkdir(parents=True)
+    path.write_text('{"schema": {', encoding="utf-8")
+    assert store.load(path) is None